@@ -1,18 +1,91 @@
+import asyncio
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastmcp.server.dependencies import get_context
 from key_value.aio.stores.disk import DiskStore
 
-_cache_stores: dict[str, DiskStore] = {}
+from automas.mcp.cache_sqlite import SqliteStore
 
+# Single root shared by all MCP caches, created once at import; the readers
+# use collections inside it instead of one directory (and store) apiece.
+ROOT_CACHE = Path.home() / ".automas" / "cache"
+ROOT_CACHE.mkdir(parents=True, exist_ok=True)
 
-def get_cache_store(cache_dir: Path) -> DiskStore:
-    """Get or create a DiskStore for the cache directory."""
+_cache_stores: dict[str, Any] = {}
+
+# In-process memoization layer over the DiskStore: turns repeated lookups
+# for the same key into memory hits instead of JSON reads from disk.
+# Eviction is frequency-first with LRU as the tiebreak: a key hit many
+# times is likely to be hit again soon (a cheap stand-in for predicted
+# reuse distance), so a burst of one-shot keys can't flush the working
+# set the way pure LRU lets it.
+_MEM_CACHE_MAX_ENTRIES = 128
+_mem_cache: OrderedDict[tuple[str, str, str], Any] = OrderedDict()
+_mem_cache_hits: Dict[tuple[str, str, str], int] = {}
+
+
+def _mem_cache_evict_one() -> None:
+    """Drop the entry with the fewest hits, oldest access breaking ties.
+
+    The scan is over at most _MEM_CACHE_MAX_ENTRIES keys, which is cheap
+    next to the disk read the cache exists to avoid. Surviving counts are
+    decayed so long-lived entries can't pin their slots forever.
+    """
+    victim = min(_mem_cache, key=lambda key: _mem_cache_hits.get(key, 0))
+    del _mem_cache[victim]
+    _mem_cache_hits.pop(victim, None)
+    for key in _mem_cache_hits:
+        _mem_cache_hits[key] >>= 1
+
+
+def _mem_cache_key(cache_dir: Path, collection: str, key: str) -> tuple[str, str, str]:
+    return (str(cache_dir), collection, key)
+
+
+def mem_cache_get(cache_dir: Path, key: str, collection: str = "default") -> Optional[Any]:
+    """Get a value from the in-process cache layer, refreshing its LRU slot."""
+    cache_key = _mem_cache_key(cache_dir, collection, key)
+    if cache_key not in _mem_cache:
+        return None
+    _mem_cache.move_to_end(cache_key)
+    _mem_cache_hits[cache_key] = _mem_cache_hits.get(cache_key, 0) + 1
+    return _mem_cache[cache_key]
+
+
+def mem_cache_put(cache_dir: Path, key: str, value: Any, collection: str = "default") -> None:
+    """Store a value in the in-process cache layer with LRU eviction."""
+    cache_key = _mem_cache_key(cache_dir, collection, key)
+    _mem_cache[cache_key] = value
+    _mem_cache.move_to_end(cache_key)
+    while len(_mem_cache) > _MEM_CACHE_MAX_ENTRIES:
+        _mem_cache_evict_one()
+
+
+def mem_cache_delete(cache_dir: Path, key: str, collection: str = "default") -> None:
+    """Drop a value from the in-process cache layer."""
+    cache_key = _mem_cache_key(cache_dir, collection, key)
+    _mem_cache.pop(cache_key, None)
+    _mem_cache_hits.pop(cache_key, None)
+
+
+def get_cache_store(cache_dir: Path) -> Any:
+    """Get or create a store for the cache directory.
+
+    The *_cache directories (image indexes and similar small records) use a
+    single WAL-mode SQLite file instead of one JSON file per key, which
+    amortizes fsyncs and avoids a dentry per entry.
+    """
     cache_key = str(cache_dir)
-    if cache_key not in _cache_stores:
-        _cache_stores[cache_key] = DiskStore(directory=cache_key)
-    return _cache_stores[cache_key]
+    store = _cache_stores.get(cache_key)
+    if store is None:
+        if cache_key == str(ROOT_CACHE) or cache_key.endswith("_cache"):
+            store = SqliteStore(directory=cache_key)
+        else:
+            store = DiskStore(directory=cache_key)
+        _cache_stores[cache_key] = store
+    return store
 
 
 async def cache_get(
@@ -46,11 +119,31 @@ async def cache_put(
     await ctx.debug(f"Cached: {collection}/{key[:8]}...")
 
 
+async def cache_put_many(
+    cache_dir: Path,
+    items: List[Tuple[str, Dict[str, Any]]],
+    collection: str = "default",
+    ttl: Optional[int] = None,
+) -> None:
+    """Save several key/value pairs, opening the store once and writing concurrently."""
+    if not items:
+        return
+
+    store = get_cache_store(cache_dir)
+    await asyncio.gather(
+        *(store.put(key=key, value=value, collection=collection, ttl=ttl) for key, value in items)
+    )
+
+    ctx = get_context()
+    await ctx.debug(f"Cached {len(items)} entries in {collection}")
+
+
 async def cache_delete(
     cache_dir: Path,
     key: str,
     collection: str = "default",
 ) -> None:
     """Delete cached data by key."""
+    mem_cache_delete(cache_dir, key, collection=collection)
     store = get_cache_store(cache_dir)
     await store.delete(key=key, collection=collection)
@@ -0,0 +1,83 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import aiosqlite
+import msgpack
+
+
+class SqliteStore:
+    """Single-file SQLite key-value store with WAL journaling.
+
+    Drop-in replacement for DiskStore's get/put/delete: one database file
+    instead of one JSON file per key, so writes share fsyncs through the
+    WAL and lookups are a single indexed read. Values are msgpack-encoded.
+    """
+
+    def __init__(self, directory: str):
+        self._db_path = str(Path(directory) / "cache.sqlite3")
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._init_lock = asyncio.Lock()
+
+    async def _connection(self) -> aiosqlite.Connection:
+        if self._conn is None:
+            async with self._init_lock:
+                if self._conn is None:
+                    Path(self._db_path).parent.mkdir(parents=True, exist_ok=True)
+                    conn = await aiosqlite.connect(self._db_path)
+                    await conn.execute("PRAGMA journal_mode=WAL")
+                    await conn.execute("PRAGMA synchronous=NORMAL")
+                    await conn.execute(
+                        "CREATE TABLE IF NOT EXISTS kv ("
+                        "collection TEXT NOT NULL, "
+                        "key TEXT NOT NULL, "
+                        "value BLOB NOT NULL, "
+                        "expires_at INTEGER, "
+                        "PRIMARY KEY (collection, key))"
+                    )
+                    await conn.commit()
+                    self._conn = conn
+        return self._conn
+
+    async def get(self, *, key: str, collection: str = "default") -> Optional[Dict[str, Any]]:
+        conn = await self._connection()
+        async with conn.execute(
+            "SELECT value, expires_at FROM kv WHERE collection = ? AND key = ?",
+            (collection, key),
+        ) as cursor:
+            row = await cursor.fetchone()
+
+        if row is None:
+            return None
+
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            await self.delete(key=key, collection=collection)
+            return None
+
+        return msgpack.unpackb(value, raw=False)
+
+    async def put(
+        self,
+        *,
+        key: str,
+        value: Dict[str, Any],
+        collection: str = "default",
+        ttl: Optional[int] = None,
+    ) -> None:
+        conn = await self._connection()
+        expires_at = int(time.time() + ttl) if ttl is not None else None
+        await conn.execute(
+            "INSERT OR REPLACE INTO kv (collection, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (collection, key, msgpack.packb(value, use_bin_type=True), expires_at),
+        )
+        await conn.commit()
+
+    async def delete(self, *, key: str, collection: str = "default") -> None:
+        conn = await self._connection()
+        await conn.execute(
+            "DELETE FROM kv WHERE collection = ? AND key = ?",
+            (collection, key),
+        )
+        await conn.commit()
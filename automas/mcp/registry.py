@@ -46,43 +46,73 @@ MCP_SERVERS: dict[str, MCPServerConfig] = {
 }
 
 
+# One MCPServerStdio per server name, shared by every pipeline in the
+# process. The server objects reference-count their enter/exit, so
+# pipelines whose lifetimes overlap share a single spawned subprocess
+# instead of each paying its own cold start — the subprocess analogue of
+# HTTP keep-alive.
+_toolset_cache: dict[str, MCPServerStdio] = {}
+
+
 def _create_single_toolset(name: str) -> MCPServerStdio:
-    """Create a single MCP toolset from server name."""
+    """Create (or reuse) a single MCP toolset from server name."""
     if name not in MCP_SERVERS:
         logger.error(f"Unknown MCP server requested: {name}")
         raise ValueError(f"Unknown MCP server: {name}")
 
+    cached = _toolset_cache.get(name)
+    if cached is not None:
+        return cached
+
     config = MCP_SERVERS[name]
 
     try:
         validate_server_config(name, config)
-        return create_mcp_server_stdio(name, config)
+        toolset = create_mcp_server_stdio(name, config)
     except ValueError as e:
         logger.error(f"Failed to create server '{name}': {e}")
         raise
 
+    _toolset_cache[name] = toolset
+    return toolset
+
 
 def get_mcp_toolsets(tool_names: list[str]) -> list[MCPServerStdio]:
     """Create MCP toolsets from server names."""
     return [_create_single_toolset(name) for name in tool_names]
 
 
-def get_server_descriptions(servers: dict[str, MCPServerConfig] | None = None) -> dict[str, str]:
-    """Get server descriptions from module DESCRIPTION or external_descriptions.py."""
-    if servers is None:
-        servers = MCP_SERVERS
+# Resolving a local server description imports its module, which pays the
+# full fastmcp/markitdown/browser_use import cost — cache the result so
+# repeated listing calls are free.
+_descriptions_cache: dict[str, str] | None = None
+
 
+def _compute_server_descriptions(servers: dict[str, MCPServerConfig]) -> dict[str, str]:
     descriptions = {}
     for name, config in servers.items():
-        if config.module_path:
+        # An entry in external_descriptions.py wins even for local servers,
+        # since it avoids importing the server module entirely.
+        external_desc = get_external_description(name)
+        if external_desc:
+            descriptions[name] = external_desc.strip()
+        elif config.module_path:
             # Local Python server - get DESCRIPTION from module
             descriptions[name] = get_server_description(config.module_path, name)
         else:
-            # External server (NPX/UVX) - try to get from external_descriptions.py
-            external_desc = get_external_description(name)
-            if external_desc:
-                descriptions[name] = external_desc.strip()
-            else:
-                descriptions[name] = f"External MCP server: {name} (no description available)"
+            descriptions[name] = f"External MCP server: {name} (no description available)"
 
     return descriptions
+
+
+def get_server_descriptions(servers: dict[str, MCPServerConfig] | None = None) -> dict[str, str]:
+    """Get server descriptions from external_descriptions.py or module DESCRIPTION."""
+    global _descriptions_cache
+
+    if servers is not None:
+        return _compute_server_descriptions(servers)
+
+    if _descriptions_cache is None:
+        _descriptions_cache = _compute_server_descriptions(MCP_SERVERS)
+
+    return _descriptions_cache
@@ -1,15 +1,14 @@
 import os
 import traceback
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
-from browser_use import Agent, Browser
-from browser_use.agent.views import AgentHistoryList
-from browser_use.llm import ChatOpenAI
-from browser_use.mcp.server import _configure_mcp_server_logging
 from dotenv import load_dotenv
 from fastmcp import Context, FastMCP
 from pydantic import BaseModel, Field
 
+if TYPE_CHECKING:
+    from browser_use.llm import ChatOpenAI
+
 
 class BrowserTaskResult(BaseModel):
     success: bool = Field(description="Whether the task completed successfully")
@@ -64,9 +63,26 @@ Example use cases:
 mcp = FastMCP("browser-usage", instructions=DESCRIPTION)
 
 
-def _create_extraction_llm(api_key: str, base_url: str) -> ChatOpenAI:
+# LLM clients carry an HTTP connection pool and TLS context; build each
+# (model, key, endpoint, temperature) combination once and reuse it across
+# browser task invocations.
+_llm_cache: dict[tuple[str, str, str, float], "ChatOpenAI"] = {}
+
+
+def _get_llm(model: str, api_key: str, base_url: str, temperature: float) -> "ChatOpenAI":
+    cache_key = (model, api_key, base_url, temperature)
+    llm = _llm_cache.get(cache_key)
+    if llm is None:
+        from browser_use.llm import ChatOpenAI
+
+        llm = ChatOpenAI(model=model, api_key=api_key, base_url=base_url, temperature=temperature)
+        _llm_cache[cache_key] = llm
+    return llm
+
+
+def _create_extraction_llm(api_key: str, base_url: str) -> "ChatOpenAI":
     extraction_model = os.environ.get("BROWSERUSE_EXTRACTION_MODEL", "google/gemini-2.5-flash")
-    return ChatOpenAI(model=extraction_model, api_key=api_key, base_url=base_url, temperature=0)
+    return _get_llm(extraction_model, api_key, base_url, 0.0)
 
 
 @mcp.tool
@@ -81,6 +97,10 @@ async def complete_browser_task(
         Field(default=True, description="Enable vision capabilities for better UI understanding"),
     ] = True,
 ) -> BrowserTaskResult:
+    # browser_use is a multi-second import; defer it to first invocation so
+    # the stdio handshake is not delayed by it at server startup.
+    from browser_use import Agent, Browser
+
     browser = None
     try:
         api_key = os.environ.get("OPENROUTER_API_KEY") or ""
@@ -104,9 +124,7 @@ async def complete_browser_task(
             keep_alive=False,
         )
 
-        main_llm = ChatOpenAI(
-            model=model, api_key=api_key, base_url=base_url, temperature=float(0.1)
-        )
+        main_llm = _get_llm(model, api_key, base_url, 0.1)
 
         extraction_llm = _create_extraction_llm(api_key, base_url)
 
@@ -128,7 +146,7 @@ async def complete_browser_task(
 
         await ctx.info("Running browser agent...")
 
-        history: AgentHistoryList | None = await agent.run(max_steps=max_steps)
+        history = await agent.run(max_steps=max_steps)
 
         if not history:
             await ctx.error("Browser execution returned no history")
@@ -183,9 +201,14 @@ async def complete_browser_task(
         error_msg = f"Browser task failed: {str(e)}"
         await ctx.error(error_msg)
 
-        return BrowserTaskResult(
-            success=False, content="", errors=[error_msg, traceback.format_exc()]
-        )
+        # Formatting the traceback walks the stack and reads source files;
+        # only pay for it when debugging is switched on.
+        if os.environ.get("AUTOMAS_DEBUG"):
+            detail = traceback.format_exc()
+        else:
+            detail = type(e).__name__
+
+        return BrowserTaskResult(success=False, content="", errors=[error_msg, detail])
 
     finally:
         if browser:
@@ -196,6 +219,8 @@ async def complete_browser_task(
 
 
 if __name__ == "__main__":
+    from browser_use.mcp.server import _configure_mcp_server_logging
+
     _configure_mcp_server_logging()
     load_dotenv(override=True)
     mcp.run(transport="stdio", show_banner=False)
@@ -1,4 +1,5 @@
 import hashlib
+import os
 import uuid
 from pathlib import Path
 from typing import Optional
@@ -11,11 +12,62 @@ def hash_string(text: str) -> str:
 
 def hash_file(file_path: str) -> str:
     """Generate SHA256 hash of file contents."""
-    hasher = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            hasher.update(chunk)
-    return hasher.hexdigest()
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+        # Python < 3.11: read into a reusable 1 MiB buffer to avoid
+        # per-chunk bytes allocations.
+        hasher = hashlib.sha256()
+        buffer = bytearray(1 << 20)
+        view = memoryview(buffer)
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            hasher.update(view[:read])
+        return hasher.hexdigest()
+
+
+def quick_fingerprint(file_path: str) -> str:
+    """Cheap content fingerprint: size, mtime and the first/last 64 KiB.
+
+    An O(128 KiB) read instead of a full-file hash — collision-resistant
+    for non-adversarial inputs, which is all a local cache key needs.
+    """
+    stat = os.stat(file_path)
+    with open(file_path, "rb") as f:
+        head = f.read(65536)
+        f.seek(max(0, stat.st_size - 65536))
+        tail = f.read(65536)
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(head)
+    digest.update(tail)
+    digest.update(stat.st_size.to_bytes(8, "little"))
+    digest.update(stat.st_mtime_ns.to_bytes(8, "little", signed=True))
+    return digest.hexdigest()
+
+
+_HASH_CACHE_MAX_ENTRIES = 1024
+_hash_cache: dict[tuple[str, int, int], str] = {}
+
+
+def hash_file_cached(file_path: str) -> str:
+    """Like hash_file, but memoized on (realpath, mtime_ns, size).
+
+    A repeated read of an unchanged file costs one stat() instead of a
+    full re-hash; an edit changes mtime/size and so invalidates the entry.
+    """
+    stat = os.stat(file_path)
+    cache_key = (os.path.realpath(file_path), stat.st_mtime_ns, stat.st_size)
+    file_hash = _hash_cache.get(cache_key)
+    if file_hash is None:
+        if len(_hash_cache) >= _HASH_CACHE_MAX_ENTRIES:
+            _hash_cache.pop(next(iter(_hash_cache)))
+        file_hash = hash_file(file_path)
+        _hash_cache[cache_key] = file_hash
+    return file_hash
 
 
 def truncate_text(text_content: str, max_lines: Optional[int]) -> str:
@@ -23,12 +75,24 @@ def truncate_text(text_content: str, max_lines: Optional[int]) -> str:
     if max_lines is None:
         return text_content
 
-    lines = text_content.split("\n")
-    if len(lines) > max_lines:
-        truncated = "\n".join(lines[:max_lines])
-        return f"{truncated}\n\n... (truncated, showing {max_lines} of {len(lines)} lines)"
+    # Agent-supplied values aren't constrained to be positive; zero or
+    # negative means "no content lines", banner only.
+    if max_lines <= 0:
+        total_lines = text_content.count("\n") + 1
+        return f"\n\n... (truncated, showing {max_lines} of {total_lines} lines)"
+
+    # Walk newline offsets instead of splitting: split() materializes a
+    # list of every line, which doubles peak memory for multi-MB text.
+    pos = 0
+    for _ in range(max_lines):
+        next_newline = text_content.find("\n", pos)
+        if next_newline == -1:
+            return text_content
+        pos = next_newline + 1
 
-    return text_content
+    truncated = text_content[: pos - 1]
+    total_lines = max_lines + 1 + text_content.count("\n", pos)
+    return f"{truncated}\n\n... (truncated, showing {max_lines} of {total_lines} lines)"
 
 
 def create_temp_directory(base_dir: str) -> Path:
@@ -1,27 +1,37 @@
+import asyncio
 import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Annotated, List, Optional
 
-from docx import Document
 from fastmcp import Context, FastMCP
-from markitdown import MarkItDown
 from pydantic import Field
 
-from automas.mcp.servers.content_utils import create_temp_directory, hash_file, truncate_text
+from automas.mcp.cache import ROOT_CACHE
+from automas.mcp.servers.content_utils import create_temp_directory, hash_file_cached, truncate_text
 from automas.mcp.servers.document.image_utils import (
     format_image_section,
     get_cached_images,
     save_cached_images,
 )
 
-CACHE_DIR = Path.home() / ".automas" / "docx_cache"
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
-
-md = MarkItDown()
+CACHE_COLLECTION = "docx_images"
 
 docx_server = FastMCP("docx-reader")
 
+# python-docx and markitdown are expensive imports; defer them to first use
+# so the stdio handshake is not delayed by them at server startup.
+_md = None
+
+
+def _get_markitdown():
+    global _md
+    if _md is None:
+        from markitdown import MarkItDown
+
+        _md = MarkItDown()
+    return _md
+
 
 @dataclass
 class ExtractedDOCXImage:
@@ -44,58 +54,91 @@ def get_image_extension(content_type: str) -> str:
     return extensions.get(content_type, ".bin")
 
 
-async def extract_images_from_docx(docx_path: str, ctx: Context) -> List[ExtractedDOCXImage]:
-    docx_hash = hash_file(docx_path)
+def _write_image_blob(image_part, image_path: Path) -> None:
+    """Write an image part to disk in 1 MiB slices on a raw fd.
+
+    Slicing a memoryview avoids copying the blob through the buffered
+    writer, and dropping the references right after the loop lets the
+    (potentially tens of MB) blob be collected immediately.
+    """
+    blob = image_part.blob
+    view = memoryview(blob)
+    fd = os.open(str(image_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        pos = 0
+        while pos < len(view):
+            pos += os.write(fd, view[pos : pos + 1048576])
+    finally:
+        os.close(fd)
+        del view, blob
+
+
+def _write_one_image(rel, output_dir: Path) -> Optional[ExtractedDOCXImage]:
+    """Extract a single image relationship to disk; None on failure."""
+    try:
+        image_part = rel.target_part
+        image_id = rel.rId
+        content_type = image_part.content_type
+
+        original_filename = os.path.basename(image_part.partname)
+
+        ext = get_image_extension(content_type)
+        if not original_filename.endswith(ext):
+            filename = f"{image_id}{ext}"
+        else:
+            filename = original_filename
+
+        image_path = output_dir / filename
+
+        _write_image_blob(image_part, image_path)
+
+        return ExtractedDOCXImage(
+            path=str(image_path),
+            image_id=image_id,
+            filename=original_filename,
+            content_type=content_type,
+        )
+    except Exception:
+        return None
+
+
+async def extract_images_from_docx(
+    docx_path: str, ctx: Context, file_hash: Optional[str] = None
+) -> List[ExtractedDOCXImage]:
+    docx_hash = file_hash or await asyncio.to_thread(hash_file_cached, docx_path)
 
-    cached = await get_cached_images(CACHE_DIR, docx_hash, ExtractedDOCXImage)
+    cached = await get_cached_images(
+        ROOT_CACHE, docx_hash, ExtractedDOCXImage, collection=CACHE_COLLECTION
+    )
     if cached is not None:
         await ctx.info(f"Using cached images ({len(cached)} images)")
         return cached
 
     output_dir = create_temp_directory("docx_images")
 
-    images = []
-
     try:
+        from docx import Document
+        from docx.opc.constants import RELATIONSHIP_TYPE as RT
+
         doc = Document(docx_path)
 
         await ctx.info("Extracting images from DOCX")
 
-        for rel in doc.part.rels.values():
-            if "image" in rel.target_ref:
-                try:
-                    image_part = rel.target_part
-                    image_id = rel.rId
-                    content_type = image_part.content_type
-
-                    original_filename = os.path.basename(image_part.partname)
-
-                    ext = get_image_extension(content_type)
-                    if not original_filename.endswith(ext):
-                        filename = f"{image_id}{ext}"
-                    else:
-                        filename = original_filename
-
-                    image_path = output_dir / filename
-
-                    with open(image_path, "wb") as f:
-                        f.write(image_part.blob)
-
-                    images.append(
-                        ExtractedDOCXImage(
-                            path=str(image_path),
-                            image_id=image_id,
-                            filename=original_filename,
-                            content_type=content_type,
-                        )
-                    )
-                except Exception:
-                    pass
+        # Exact reltype comparison instead of a substring scan on target_ref:
+        # cheaper, and immune to non-image targets that merely contain "image".
+        image_rels = [rel for rel in doc.part.rels.values() if rel.reltype == RT.IMAGE]
+        results = await asyncio.gather(
+            *(asyncio.to_thread(_write_one_image, rel, output_dir) for rel in image_rels)
+        )
+        images = [image for image in results if image is not None]
+
+        # Release the parsed document before awaiting the cache write.
+        del image_rels, doc
 
     except Exception as e:
         raise Exception(f"Error extracting images from DOCX: {e}")
 
-    await save_cached_images(CACHE_DIR, docx_hash, images)
+    await save_cached_images(ROOT_CACHE, docx_hash, images, collection=CACHE_COLLECTION)
 
     if images:
         await ctx.info(f"Extracted {len(images)} images from DOCX")
@@ -128,10 +171,16 @@ async def read_docx(
 
         await ctx.info(f"Reading DOCX: {file_name}")
 
-        text_content = md.convert(expanded_path).text_content
-        text_content = truncate_text(text_content, max_lines)
+        # The shared MarkItDown instance is thread-safe for conversions; run
+        # the synchronous parse off the event loop and hash the file for the
+        # image cache key in parallel with it.
+        result, file_hash = await asyncio.gather(
+            asyncio.to_thread(_get_markitdown().convert, expanded_path),
+            asyncio.to_thread(hash_file_cached, expanded_path),
+        )
+        text_content = truncate_text(result.text_content, max_lines)
 
-        images = await extract_images_from_docx(expanded_path, ctx)
+        images = await extract_images_from_docx(expanded_path, ctx, file_hash=file_hash)
 
         text_content += format_image_section(
             images, [("path", "Path"), ("filename", "Filename"), ("content_type", "Type")]
@@ -1,51 +1,80 @@
-from dataclasses import asdict
+import asyncio
+import os
 from pathlib import Path
-from typing import Any, List, Optional, Type, TypeVar
+from typing import Any, Dict, List, Optional, Set, Type, TypeVar
 
-from automas.mcp.cache import cache_delete, cache_get, cache_put
+from automas.mcp.cache import cache_delete, cache_get, cache_put, mem_cache_get, mem_cache_put
 
 T = TypeVar("T")
 
 
+def _list_existing_files(items: List[dict]) -> Dict[str, Set[str]]:
+    """Map each parent directory of the cached paths to its current filenames."""
+    parents = {os.path.dirname(item["path"]) for item in items}
+    return {
+        parent: set(os.listdir(parent)) for parent in parents if os.path.isdir(parent)
+    }
+
+
 async def get_cached_images(
-    cache_dir: Path, file_hash: str, dataclass_constructor: Type[T]
+    cache_dir: Path,
+    file_hash: str,
+    dataclass_constructor: Type[T],
+    collection: str = "images",
 ) -> Optional[List[T]]:
     """Get cached images, validating that files still exist."""
-    cached_data = await cache_get(cache_dir, key=file_hash, collection="images")
+    cached_items = mem_cache_get(cache_dir, key=file_hash, collection=collection)
 
-    if not cached_data or "items" not in cached_data:
-        return None
+    if cached_items is None:
+        cached_data = await cache_get(cache_dir, key=file_hash, collection=collection)
+
+        if not cached_data or "items" not in cached_data:
+            return None
+
+        cached_items = cached_data["items"]
+
+    # One readdir per output directory instead of one stat() per image.
+    existing = await asyncio.to_thread(_list_existing_files, cached_items)
 
     images = []
-    for img_data in cached_data["items"]:
-        if Path(img_data["path"]).exists():
+    invalid = False
+    for img_data in cached_items:
+        path = img_data["path"]
+        if os.path.basename(path) in existing.get(os.path.dirname(path), ()):
             images.append(dataclass_constructor(**img_data))
         else:
-            await cache_delete(cache_dir, key=file_hash, collection="images")
-            return None
+            invalid = True
+            break
+
+    if invalid:
+        await cache_delete(cache_dir, key=file_hash, collection=collection)
+        return None
 
+    mem_cache_put(cache_dir, key=file_hash, value=cached_items, collection=collection)
     return images
 
 
-async def save_cached_images(cache_dir: Path, file_hash: str, images: List[Any]) -> None:
+async def save_cached_images(
+    cache_dir: Path, file_hash: str, images: List[Any], collection: str = "images"
+) -> None:
     """Save images to cache with 30-day TTL."""
-    data = {"items": [asdict(img) for img in images]}
-    await cache_put(cache_dir, key=file_hash, value=data, collection="images", ttl=2592000)
+    # The image dataclasses are flat, so a shallow copy of __dict__ gives the
+    # same payload as dataclasses.asdict without its recursive deepcopy.
+    data = {"items": [dict(vars(img)) for img in images]}
+    await cache_put(cache_dir, key=file_hash, value=data, collection=collection, ttl=2592000)
 
 
 def format_image_section(images: List[Any], field_formatters: List[tuple[str, str]]) -> str:
     if not images:
         return ""
 
-    result = "\n\n" + "=" * 80 + "\n"
-    result += "EXTRACTED IMAGES\n"
-    result += "=" * 80 + "\n\n"
+    parts = ["\n\n", "=" * 80, "\n", "EXTRACTED IMAGES\n", "=" * 80, "\n\n"]
 
     for idx, img in enumerate(images, 1):
-        result += f"Image {idx}:\n"
+        parts.append(f"Image {idx}:\n")
         for field_name, label in field_formatters:
             value = getattr(img, field_name)
-            result += f"  {label}: {value}\n"
-        result += "\n"
+            parts.append(f"  {label}: {value}\n")
+        parts.append("\n")
 
-    return result
+    return "".join(parts)
@@ -1,29 +1,112 @@
+import asyncio
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from pathlib import Path
 from typing import Annotated, Any, List, Optional, Tuple
 
 from fastmcp import Context, FastMCP
-from markitdown import MarkItDown
-from pdfminer.high_level import extract_pages
-from pdfminer.image import ImageWriter
-from pdfminer.layout import LTContainer, LTFigure, LTImage
 from pydantic import Field
 
-from automas.mcp.servers.content_utils import create_temp_directory, hash_file, truncate_text
+from automas.mcp.cache import ROOT_CACHE
+from automas.mcp.servers.content_utils import create_temp_directory, hash_file_cached, truncate_text
 from automas.mcp.servers.document.image_utils import (
     format_image_section,
     get_cached_images,
     save_cached_images,
 )
 
-CACHE_DIR = Path.home() / ".automas" / "pdf_cache"
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
-
-md = MarkItDown()
+CACHE_COLLECTION = "pdf_images"
 
 pdf_server = FastMCP("pdf-reader")
 
+# pdfminer and markitdown are expensive imports; defer them to first use
+# so the stdio handshake is not delayed by them at server startup.
+_md = None
+
+
+def _get_markitdown():
+    global _md
+    if _md is None:
+        from markitdown import MarkItDown
+
+        _md = MarkItDown()
+    return _md
+
+
+# Heuristic used to translate a line budget into a pdfminer page budget.
+_LINES_PER_PAGE_GUESS = 40
+
+# Image decode (zlib inflate plus JPEG/PNG re-encode) is CPU-bound and
+# holds the GIL, so page extraction fans out across worker processes.
+# The pool is created lazily and kept for the life of the server; spawn
+# keeps the children clear of the parent's event-loop state.
+_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=_EXTRACT_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def _count_pages(pdf_path: str) -> int:
+    from pdfminer.pdfpage import PDFPage
+
+    # Count from the page tree only; materializing the laid-out pages
+    # would hold every page in memory at once.
+    with open(pdf_path, "rb") as fp:
+        return sum(1 for _ in PDFPage.get_pages(fp))
+
+
+def _extract_images_for_pages(
+    pdf_path: str, page_indices: List[int], output_dir: str
+) -> List["ExtractedImage"]:
+    """Extract images from a subset of pages; runs inside a worker process.
+
+    Each worker writes into its own subdirectory so image names cannot
+    collide across processes. page_indices must be sorted: extract_pages
+    yields the selected pages in document order.
+    """
+    from pdfminer.high_level import extract_pages
+    from pdfminer.image import ImageWriter
+
+    os.makedirs(output_dir, exist_ok=True)
+    image_writer = ImageWriter(output_dir)
+    images: List[ExtractedImage] = []
+
+    with open(pdf_path, "rb") as fp:
+        for page_idx, page_layout in zip(
+            page_indices, extract_pages(fp, page_numbers=set(page_indices))
+        ):
+            images.extend(_extract_images_from_layout(page_layout, image_writer, page_idx + 1))
+            # Keep at most one page's layout tree alive across the loop.
+            del page_layout
+
+    return images
+
+
+def _extract_pdf_text_bounded(pdf_path: str, max_lines: Optional[int]) -> str:
+    """Extract PDF text, stopping early when max_lines bounds the output.
+
+    MarkItDown's PDF path is pdfminer's extract_text, so a bounded read can
+    call it directly with a page-count guess; only when the guess comes up
+    short do we pay for the full conversion.
+    """
+    from pdfminer.high_level import extract_text
+
+    if max_lines is not None:
+        guessed_pages = max(1, max_lines // _LINES_PER_PAGE_GUESS)
+        text = extract_text(pdf_path, maxpages=guessed_pages)
+        if text.count("\n") >= max_lines:
+            return text
+
+    return _get_markitdown().convert(pdf_path).text_content
+
 
 @dataclass
 class ExtractedImage:
@@ -35,35 +118,55 @@ class ExtractedImage:
     name: str
 
 
-async def extract_images_from_pdf(pdf_path: str, ctx: Context) -> List[ExtractedImage]:
-    pdf_hash = hash_file(pdf_path)
+async def extract_images_from_pdf(
+    pdf_path: str, ctx: Context, file_hash: Optional[str] = None
+) -> List[ExtractedImage]:
+    pdf_hash = file_hash or await asyncio.to_thread(hash_file_cached, pdf_path)
 
-    cached = await get_cached_images(CACHE_DIR, pdf_hash, ExtractedImage)
+    cached = await get_cached_images(
+        ROOT_CACHE, pdf_hash, ExtractedImage, collection=CACHE_COLLECTION
+    )
     if cached is not None:
         await ctx.info(f"Using cached images ({len(cached)} images)")
         return cached
 
     output_dir = create_temp_directory("pdf_images")
 
-    image_writer = ImageWriter(str(output_dir))
-    images = []
+    total_pages = await asyncio.to_thread(_count_pages, pdf_path)
+    await ctx.info(f"Extracting images from {total_pages} pages")
+
+    # Stripe the pages across the worker pool; each stripe stays sorted,
+    # which extract_pages requires to pair indices with yielded layouts.
+    workers = max(1, min(_EXTRACT_WORKERS, total_pages))
+    stripes = [list(range(stripe, total_pages, workers)) for stripe in range(workers)]
+
+    loop = asyncio.get_running_loop()
+    done = 0
+
+    async def _run_stripe(idx: int, pages: List[int]) -> List[ExtractedImage]:
+        nonlocal done
+        part = await loop.run_in_executor(
+            _get_pool(),
+            _extract_images_for_pages,
+            pdf_path,
+            pages,
+            os.path.join(str(output_dir), f"part{idx}"),
+        )
+        done += 1
+        if workers > 1:
+            await ctx.report_progress(progress=done, total=workers)
+        return part
 
     try:
-        with open(pdf_path, "rb") as fp:
-            pages = list(extract_pages(fp))
-            total_pages = len(pages)
-
-            await ctx.info(f"Extracting images from {total_pages} pages")
-
-            for page_num, page_layout in enumerate(pages, start=1):
-                if total_pages > 1:
-                    await ctx.report_progress(progress=page_num, total=total_pages)
-
-                images.extend(_extract_images_from_layout(page_layout, image_writer, page_num))
+        parts = await asyncio.gather(
+            *(_run_stripe(idx, pages) for idx, pages in enumerate(stripes))
+        )
     except Exception as e:
         raise Exception(f"Error extracting images from PDF: {e}")
 
-    await save_cached_images(CACHE_DIR, pdf_hash, images)
+    images = sorted((image for part in parts for image in part), key=lambda image: image.page)
+
+    await save_cached_images(ROOT_CACHE, pdf_hash, images, collection=CACHE_COLLECTION)
 
     await ctx.info(f"Extracted {len(images)} images from PDF")
 
@@ -71,35 +174,39 @@ async def extract_images_from_pdf(pdf_path: str, ctx: Context) -> List[Extracted
 
 
 def _extract_images_from_layout(
-    layout_obj: Any, image_writer: ImageWriter, page_num: int
+    layout_obj: Any, image_writer: Any, page_num: int
 ) -> List[ExtractedImage]:
-    images = []
+    from pdfminer.layout import LTContainer, LTImage
 
-    if isinstance(layout_obj, LTImage):
-        try:
-            image_filename = image_writer.export_image(layout_obj)
-            image_path = os.path.join(image_writer.outdir, image_filename)
-
-            images.append(
-                ExtractedImage(
-                    path=image_path,
-                    page=page_num,
-                    bbox=(layout_obj.x0, layout_obj.y0, layout_obj.x1, layout_obj.y1),
-                    width=layout_obj.width,
-                    height=layout_obj.height,
-                    name=layout_obj.name,
+    # Walk the layout tree with an explicit stack: recursion allocated an
+    # intermediate list per container and risked the recursion limit on
+    # deeply nested figure trees.
+    images = []
+    stack = [layout_obj]
+
+    while stack:
+        obj = stack.pop()
+
+        if isinstance(obj, LTImage):
+            try:
+                image_filename = image_writer.export_image(obj)
+                image_path = os.path.join(image_writer.outdir, image_filename)
+
+                images.append(
+                    ExtractedImage(
+                        path=image_path,
+                        page=page_num,
+                        bbox=(obj.x0, obj.y0, obj.x1, obj.y1),
+                        width=obj.width,
+                        height=obj.height,
+                        name=obj.name,
+                    )
                 )
-            )
-        except Exception:
-            pass
+            except Exception:
+                pass
 
-    elif isinstance(layout_obj, LTFigure):
-        for child in layout_obj:
-            images.extend(_extract_images_from_layout(child, image_writer, page_num))
-
-    elif isinstance(layout_obj, LTContainer):
-        for child in layout_obj:
-            images.extend(_extract_images_from_layout(child, image_writer, page_num))
+        elif isinstance(obj, LTContainer):
+            stack.extend(obj)
 
     return images
 
@@ -129,10 +236,15 @@ async def read_pdf(
 
         await ctx.info(f"Reading PDF: {file_name}")
 
-        text_content = md.convert(expanded_path).text_content
+        # Run the synchronous text extraction off the event loop and hash the
+        # file for the image cache key in parallel with it.
+        text_content, file_hash = await asyncio.gather(
+            asyncio.to_thread(_extract_pdf_text_bounded, expanded_path, max_lines),
+            asyncio.to_thread(hash_file_cached, expanded_path),
+        )
         text_content = truncate_text(text_content, max_lines)
 
-        images = await extract_images_from_pdf(expanded_path, ctx)
+        images = await extract_images_from_pdf(expanded_path, ctx, file_hash=file_hash)
 
         text_content += format_image_section(
             images, [("path", "Path"), ("page", "Page"), ("name", "Name")]
@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import os
 from dataclasses import dataclass
 from pathlib import Path
@@ -6,17 +8,18 @@ from typing import Annotated, List, Optional
 from fastmcp import Context, FastMCP
 from markitdown import MarkItDown
 from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
 from pydantic import Field
 
-from automas.mcp.servers.content_utils import create_temp_directory, hash_file, truncate_text
+from automas.mcp.cache import ROOT_CACHE
+from automas.mcp.servers.content_utils import create_temp_directory, quick_fingerprint, truncate_text
 from automas.mcp.servers.document.image_utils import (
     format_image_section,
     get_cached_images,
     save_cached_images,
 )
 
-CACHE_DIR = Path.home() / ".automas" / "pptx_cache"
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
+CACHE_COLLECTION = "pptx_images"
 
 md = MarkItDown()
 
@@ -32,20 +35,80 @@ class ExtractedPPTXImage:
     height: float
 
 
+@functools.lru_cache(maxsize=8)
+def _load_pptx_cached(pptx_path: str, mtime_ns: int):
+    return Presentation(pptx_path)
+
+
+def _load_pptx(pptx_path: str):
+    """Parse the deck once per (path, mtime); text and image extraction share it."""
+    return _load_pptx_cached(pptx_path, os.stat(pptx_path).st_mtime_ns)
+
+
+def _extract_pptx_text_bounded(pptx_path: str, max_lines: Optional[int]) -> str:
+    """Extract slide text, stopping once the line budget is met.
+
+    Converting a whole deck just to keep the first max_lines lines wastes
+    most of the parse for large presentations; with a budget set, iterate
+    slides directly and stop as soon as enough lines have been produced.
+    Without a budget, fall back to the full MarkItDown conversion.
+    """
+    if max_lines is None:
+        return md.convert(pptx_path).text_content
+
+    lines: List[str] = []
+    prs = _load_pptx(pptx_path)
+
+    for slide_idx, slide in enumerate(prs.slides, start=1):
+        lines.append(f"<!-- Slide number: {slide_idx} -->")
+        for shape in slide.shapes:
+            if shape.has_text_frame:
+                lines.extend(shape.text_frame.text.splitlines())
+        lines.append("")
+
+        if len(lines) > max_lines:
+            break
+
+    return "\n".join(lines)
+
+
+def _iter_picture_shapes(shapes):
+    """Yield picture shapes, descending into groups.
+
+    The shape_type compare is an integer check, unlike hasattr(shape,
+    "image") which walked the XML for every shape — and the hasattr probe
+    never saw pictures nested inside group shapes at all.
+    """
+    for shape in shapes:
+        if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+            yield shape
+        elif shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+            yield from _iter_picture_shapes(shape.shapes)
+
+
+def _write_blob(image_path: Path, blob: bytes) -> None:
+    with open(image_path, "wb") as f:
+        f.write(blob)
+
+
 async def extract_images_from_pptx(pptx_path: str, ctx: Context) -> List[ExtractedPPTXImage]:
-    pptx_hash = hash_file(pptx_path)
+    pptx_hash = await asyncio.to_thread(quick_fingerprint, pptx_path)
 
-    cached = await get_cached_images(CACHE_DIR, pptx_hash, ExtractedPPTXImage)
+    cached = await get_cached_images(
+        ROOT_CACHE, pptx_hash, ExtractedPPTXImage, collection=CACHE_COLLECTION
+    )
     if cached is not None:
         await ctx.info(f"Using cached images ({len(cached)} images)")
         return cached
 
     output_dir = create_temp_directory("pptx_images")
 
-    images = []
+    # Collect (path, blob, metadata) while walking slides single-threaded
+    # (lxml is not thread-safe), then fan the disk writes out to threads.
+    pending = []
 
     try:
-        prs = Presentation(pptx_path)
+        prs = await asyncio.to_thread(_load_pptx, pptx_path)
         total_slides = len(prs.slides)
 
         await ctx.info(f"Extracting images from {total_slides} slides")
@@ -53,36 +116,46 @@ async def extract_images_from_pptx(pptx_path: str, ctx: Context) -> List[Extract
         for slide_idx, slide in enumerate(prs.slides, start=1):
             if total_slides > 1:
                 await ctx.report_progress(progress=slide_idx, total=total_slides)
-            for shape_idx, shape in enumerate(slide.shapes):
-                if hasattr(shape, "image"):
-                    try:
-                        image = shape.image
-                        ext = image.ext
-                        if not ext.startswith("."):
-                            ext = f".{ext}"
-
-                        filename = f"slide{slide_idx}_shape{shape_idx}{ext}"
-                        image_path = output_dir / filename
-
-                        with open(image_path, "wb") as f:
-                            f.write(image.blob)
-
-                        images.append(
+            for shape_idx, shape in enumerate(_iter_picture_shapes(slide.shapes)):
+                try:
+                    image = shape.image
+                    ext = image.ext
+                    if not ext.startswith("."):
+                        ext = f".{ext}"
+
+                    filename = f"slide{slide_idx}_shape{shape_idx}{ext}"
+                    image_path = output_dir / filename
+
+                    pending.append(
+                        (
+                            image_path,
+                            image.blob,
                             ExtractedPPTXImage(
                                 path=str(image_path),
                                 slide_number=slide_idx,
                                 shape_name=shape.name,
                                 width=shape.width,
                                 height=shape.height,
-                            )
+                            ),
                         )
-                    except Exception:
-                        pass
+                    )
+                except Exception:
+                    pass
 
     except Exception as e:
         raise Exception(f"Error extracting images from PPTX: {e}")
 
-    await save_cached_images(CACHE_DIR, pptx_hash, images)
+    results = await asyncio.gather(
+        *(asyncio.to_thread(_write_blob, path, blob) for path, blob, _ in pending),
+        return_exceptions=True,
+    )
+    images = [
+        meta
+        for (_, _, meta), result in zip(pending, results)
+        if not isinstance(result, Exception)
+    ]
+
+    await save_cached_images(ROOT_CACHE, pptx_hash, images, collection=CACHE_COLLECTION)
 
     if images:
         await ctx.info(f"Extracted {len(images)} images from PPTX")
@@ -115,7 +188,7 @@ async def read_pptx(
 
         await ctx.info(f"Reading PPTX: {file_name}")
 
-        text_content = md.convert(expanded_path).text_content
+        text_content = await asyncio.to_thread(_extract_pptx_text_bounded, expanded_path, max_lines)
         text_content = truncate_text(text_content, max_lines)
 
         images = await extract_images_from_pptx(expanded_path, ctx)
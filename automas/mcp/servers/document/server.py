@@ -60,9 +60,9 @@ async def extract_text(file_path: str, ctx: Context) -> str:
         file_name = os.path.basename(file_path)
 
         await ctx.info(f"Reading text file: {file_name}")
-        content = md.convert(expanded_path).text_content
+        result = await asyncio.to_thread(md.convert, expanded_path)
 
-        return content
+        return result.text_content
     except Exception as e:
         await ctx.error(f"Failed to read text file: {e}")
         return f"Error reading text file: {e}"
@@ -1,4 +1,8 @@
+import asyncio
+import io
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Annotated, List, Optional
@@ -9,15 +13,15 @@ from openpyxl import load_workbook
 from openpyxl_image_loader import SheetImageLoader
 from pydantic import Field
 
-from automas.mcp.servers.content_utils import create_temp_directory, hash_file, truncate_text
+from automas.mcp.cache import ROOT_CACHE
+from automas.mcp.servers.content_utils import create_temp_directory, quick_fingerprint, truncate_text
 from automas.mcp.servers.document.image_utils import (
     format_image_section,
     get_cached_images,
     save_cached_images,
 )
 
-CACHE_DIR = Path.home() / ".automas" / "xlsx_cache"
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
+CACHE_COLLECTION = "xlsx_images"
 
 md = MarkItDown()
 
@@ -33,65 +37,117 @@ class ExtractedXLSXImage:
     height: int
 
 
-async def extract_images_from_xlsx(xlsx_path: str, ctx: Context) -> List[ExtractedXLSXImage]:
-    xlsx_hash = hash_file(xlsx_path)
+# Pool for per-sheet extraction: the PIL decode/encode work is CPU-bound,
+# so processes rather than threads let sheets scale across cores. spawn
+# keeps the children clear of the parent's event-loop state.
+_proc_pool: Optional[ProcessPoolExecutor] = None
 
-    cached = await get_cached_images(CACHE_DIR, xlsx_hash, ExtractedXLSXImage)
-    if cached is not None:
-        await ctx.info(f"Using cached images ({len(cached)} images)")
-        return cached
 
-    output_dir = create_temp_directory("xlsx_images")
+def _get_proc_pool() -> ProcessPoolExecutor:
+    global _proc_pool
+    if _proc_pool is None:
+        _proc_pool = ProcessPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _proc_pool
 
+
+def _extract_sheet_images(
+    xlsx_path: str, sheet_name: str, sheet_idx: int, output_dir: str
+) -> List[ExtractedXLSXImage]:
+    """Extract one sheet's images; runs in a worker process, so it re-opens the workbook."""
     images = []
-    wb = None
+    wb = load_workbook(xlsx_path)
 
     try:
-        wb = load_workbook(xlsx_path)
-        total_sheets = len(wb.sheetnames)
+        from PIL import Image as PILImage
 
-        await ctx.info(f"Extracting images from {total_sheets} sheets")
+        sheet = wb[sheet_name]
+        image_loader = SheetImageLoader(sheet)
 
-        for sheet_idx, sheet_name in enumerate(wb.sheetnames, start=1):
-            if total_sheets > 1:
-                await ctx.report_progress(progress=sheet_idx, total=total_sheets)
+        for img_cell, data_fn in image_loader._images.items():
+            try:
+                # The loader stores the raw archive bytes; write them as-is
+                # instead of decoding to PIL and paying a PNG re-encode.
+                # Opening the header is enough for format and dimensions.
+                raw = data_fn()
+                with PILImage.open(io.BytesIO(raw)) as header:
+                    fmt = (header.format or "png").lower()
+                    width, height = header.size
+
+                ext = "jpg" if fmt == "jpeg" else fmt
+                filename = f"sheet{sheet_idx}_{img_cell}.{ext}"
+                image_path = Path(output_dir) / filename
+
+                with open(image_path, "wb") as f:
+                    f.write(raw)
+
+                images.append(
+                    ExtractedXLSXImage(
+                        path=str(image_path),
+                        sheet_name=sheet_name,
+                        cell=img_cell,
+                        width=width,
+                        height=height,
+                    )
+                )
+            except Exception:
+                pass
+
+    except Exception:
+        pass
+    finally:
+        wb.close()
+
+    return images
 
-            sheet = wb[sheet_name]
 
+async def extract_images_from_xlsx(xlsx_path: str, ctx: Context) -> List[ExtractedXLSXImage]:
+    xlsx_hash = await asyncio.to_thread(quick_fingerprint, xlsx_path)
+
+    cached = await get_cached_images(
+        ROOT_CACHE, xlsx_hash, ExtractedXLSXImage, collection=CACHE_COLLECTION
+    )
+    if cached is not None:
+        await ctx.info(f"Using cached images ({len(cached)} images)")
+        return cached
+
+    output_dir = create_temp_directory("xlsx_images")
+
+    try:
+        def _read_sheet_names() -> List[str]:
+            wb = load_workbook(xlsx_path, read_only=True)
             try:
-                image_loader = SheetImageLoader(sheet)
+                return wb.sheetnames
+            finally:
+                wb.close()
 
-                for img_cell in image_loader._images.keys():
-                    try:
-                        image = image_loader.get(img_cell)
+        sheet_names = await asyncio.to_thread(_read_sheet_names)
 
-                        filename = f"sheet{sheet_idx}_{img_cell}.png"
-                        image_path = output_dir / filename
+        total_sheets = len(sheet_names)
 
-                        image.save(image_path)
+        await ctx.info(f"Extracting images from {total_sheets} sheets")
 
-                        images.append(
-                            ExtractedXLSXImage(
-                                path=str(image_path),
-                                sheet_name=sheet_name,
-                                cell=img_cell,
-                                width=image.width,
-                                height=image.height,
-                            )
-                        )
-                    except Exception:
-                        pass
+        loop = asyncio.get_running_loop()
+        pool = _get_proc_pool()
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    pool, _extract_sheet_images, xlsx_path, sheet_name, sheet_idx, str(output_dir)
+                )
+                for sheet_idx, sheet_name in enumerate(sheet_names, start=1)
+            )
+        )
+        images = [image for sheet_images in results for image in sheet_images]
 
-            except Exception:
-                pass
+        if total_sheets > 1:
+            await ctx.report_progress(progress=total_sheets, total=total_sheets)
 
     except Exception as e:
         raise Exception(f"Error extracting images from XLSX: {e}")
-    finally:
-        if wb is not None:
-            wb.close()
 
-    await save_cached_images(CACHE_DIR, xlsx_hash, images)
+    await save_cached_images(ROOT_CACHE, xlsx_hash, images, collection=CACHE_COLLECTION)
 
     if images:
         await ctx.info(f"Extracted {len(images)} images from XLSX")
@@ -124,8 +180,8 @@ async def read_xlsx_xls(
 
         await ctx.info(f"Reading XLSX: {file_name}")
 
-        text_content = md.convert(expanded_path).text_content
-        text_content = truncate_text(text_content, max_lines)
+        result = await asyncio.to_thread(md.convert, expanded_path)
+        text_content = truncate_text(result.text_content, max_lines)
 
         images = await extract_images_from_xlsx(expanded_path, ctx)
 
@@ -1,4 +1,5 @@
 import asyncio
+import os
 import re
 import urllib.parse
 from pathlib import Path
@@ -36,6 +37,36 @@ Example use cases:
 
 mcp = FastMCP("fetch-url-content", instructions=DESCRIPTION)
 
+_DOWNLOAD_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "*/*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Connection": "keep-alive",
+}
+
+# One shared client so concurrent downloads reuse connections (and HTTP/2
+# multiplexing) instead of paying a TLS handshake per URL; the semaphore
+# bounds how many downloads are in flight at once.
+_client: Optional[httpx.AsyncClient] = None
+_download_semaphore = asyncio.Semaphore(16)
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=True,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            headers=_DOWNLOAD_HEADERS,
+        )
+    return _client
+
 
 class DownloadResult(BaseModel):
     file_path: str = Field(..., description="Full path where the file was saved")
@@ -52,8 +83,11 @@ class DownloadResponse(BaseModel):
     failed_count: int = Field(..., description="Number of failed downloads")
 
 
+_SANITIZE_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
 def _sanitize_filename(filename: str) -> str:
-    sanitized = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "_", filename)
+    sanitized = _SANITIZE_RE.sub("_", filename)
     sanitized = sanitized.strip(". ")
 
     if not sanitized:
@@ -75,10 +109,11 @@ def _extract_filename_from_url(url: str) -> str:
         filename = urllib.parse.unquote(filename)
 
         if not filename:
-            query_params = urllib.parse.parse_qs(parsed_url.query)
-            for key in ["file", "filename", "name"]:
-                if key in query_params:
-                    filename = query_params[key][0]
+            # parse_qsl avoids parse_qs's dict-of-lists build; scan pairs in
+            # order and stop at the first filename-ish key.
+            for key, value in urllib.parse.parse_qsl(parsed_url.query):
+                if key in ("file", "filename", "name"):
+                    filename = value
                     break
 
         if not filename:
@@ -94,20 +129,22 @@ def _extract_filename_from_url(url: str) -> str:
 
 
 def _get_unique_filepath(file_path: Path) -> Path:
-    if not file_path.exists():
+    # One readdir instead of a stat() probe per collision candidate.
+    parent = file_path.parent
+    existing = set(os.listdir(parent)) if parent.is_dir() else set()
+
+    if file_path.name not in existing:
         return file_path
 
     stem = file_path.stem
     suffix = file_path.suffix
-    parent = file_path.parent
     counter = 1
 
-    while True:
-        new_path = parent / f"{stem}_{counter}{suffix}"
-        if not new_path.exists():
-            return new_path
+    while f"{stem}_{counter}{suffix}" in existing:
         counter += 1
 
+    return parent / f"{stem}_{counter}{suffix}"
+
 
 async def _download_single_file_internal(
     url: str,
@@ -134,41 +171,34 @@ async def _download_single_file_internal(
 
         max_size_bytes = max_size_mb * 1024 * 1024
 
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
-            "Accept": "*/*",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Connection": "keep-alive",
-        }
-
-        async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-            try:
-                head_response = await client.head(url, headers=headers)
-                content_length = head_response.headers.get("Content-Length")
-
-                if content_length:
-                    size = int(content_length)
-                    if size > max_size_bytes:
-                        size_mb = size / (1024 * 1024)
-                        raise ValueError(
-                            f"File size ({size_mb:.2f} MB) exceeds maximum allowed size ({max_size_mb} MB)"
-                        )
-            except httpx.HTTPStatusError:
-                pass
-
-            async with client.stream("GET", url, headers=headers) as response:
+        client = _get_client()
+
+        async with _download_semaphore:
+            # No HEAD preflight: it costs a full round-trip, is often 405'd,
+            # and its Content-Length is less trustworthy than the GET's. The
+            # size limit is enforced from the GET headers before any byte is
+            # written, and again during the chunk loop for servers that lie.
+            async with client.stream("GET", url, timeout=timeout) as response:
                 response.raise_for_status()
 
+                content_length = response.headers.get("Content-Length")
+                if content_length and int(content_length) > max_size_bytes:
+                    size_mb = int(content_length) / (1024 * 1024)
+                    raise ValueError(
+                        f"File size ({size_mb:.2f} MB) exceeds maximum allowed size ({max_size_mb} MB)"
+                    )
+
                 content_type = response.headers.get("Content-Type")
                 downloaded = 0
 
-                with open(file_path, "wb") as f:
-                    async for chunk in response.aiter_bytes(chunk_size=8192):
+                # 1 MiB chunks through a raw fd: ~128x fewer Python-level
+                # write calls than the old 8 KiB buffered loop.
+                fd = os.open(str(file_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    if hasattr(os, "posix_fadvise"):
+                        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+                    async for chunk in response.aiter_bytes(chunk_size=1 << 20):
                         downloaded += len(chunk)
 
                         if downloaded > max_size_bytes:
@@ -179,7 +209,12 @@ async def _download_single_file_internal(
                                 f"File exceeded size limit during download ({size_mb:.2f} MB > {max_size_mb} MB)"
                             )
 
-                        f.write(chunk)
+                        # Offload the write: a 1 MiB os.write to a slow disk
+                        # can block for milliseconds, and this loop shares the
+                        # event loop with every other in-flight download.
+                        await asyncio.to_thread(os.write, fd, chunk)
+                finally:
+                    os.close(fd)
 
                 if not file_path.exists():
                     raise ValueError("File was not created")
@@ -1,7 +1,10 @@
-import mimetypes
+import asyncio
+import functools
 import os
-from typing import Annotated, Optional, Dict, Any
+from pathlib import Path as FilePath
+from typing import Annotated, List, Optional, Dict, Any
 
+import orjson
 from dotenv import load_dotenv
 from fastmcp import Context, FastMCP
 from pydantic import BaseModel, Field
@@ -10,10 +13,34 @@ from pydantic_ai.messages import AudioUrl, BinaryContent
 from pydantic_ai.models.openai import OpenAIChatModel
 from pydantic_ai.providers.openrouter import OpenRouterProvider
 
+from automas.mcp.cache import ROOT_CACHE, cache_get, cache_put
+from automas.mcp.servers.content_utils import hash_string, quick_fingerprint
+
 load_dotenv()
 
 DEFAULT_TRANSCRIPTION_MODEL = os.getenv("AUDIO_MODEL", "openai/gpt-4o-audio-preview")
 DEFAULT_AUDIO_MAX_TOKENS = int(os.getenv("AUDIO_MAX_TOKENS", "2048"))  # <<< ДОБАВИЛИ
+MEDIA_BATCH_CONCURRENCY = int(os.getenv("MEDIA_BATCH_CONCURRENCY", "8"))
+AUDIO_MAX_BYTES = int(os.getenv("AUDIO_MAX_BYTES", str(64 * 1024 * 1024)))
+RESULT_CACHE_TTL = int(os.getenv("MEDIA_RESULT_CACHE_TTL", "3600"))
+
+CACHE_COLLECTION = "audio_results"
+
+# The supported set is small and fixed (see DESCRIPTION), so a static
+# table avoids mimetypes' lazy system-file init and covers exactly the
+# formats the server accepts.
+_AUDIO_MIME = {
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/wav",
+    ".flac": "audio/flac",
+    ".oga": "audio/ogg",
+    ".ogg": "audio/ogg",
+    ".aiff": "audio/aiff",
+    ".aac": "audio/aac",
+    ".m4a": "audio/mp4",
+    ".wma": "audio/x-ms-wma",
+    ".opus": "audio/opus",
+}
 
 
 DESCRIPTION = """
@@ -21,6 +48,7 @@ Audio transcription server using Pydantic AI.
 
 Tools:
 - transcribe_audio: Transcribe audio file with optional custom prompt for summarization or specific instructions
+- transcribe_audio_batch: Transcribe several audio files concurrently in one call
 
 Supported formats: .mp3, .wav, .flac, .oga, .ogg, .aiff, .aac, .m4a, .wma, .opus
 Supports Google Cloud Storage URIs (gs://)
@@ -32,6 +60,13 @@ class TranscriptionOutput(BaseModel):
     error: Optional[str] = Field(default=None, description="Error message if transcription failed")
 
 
+@functools.lru_cache(maxsize=4)
+def _get_provider(api_key: str) -> OpenRouterProvider:
+    """One provider per API key; agents then share its HTTP client instead
+    of constructing a provider (and connection pool) apiece."""
+    return OpenRouterProvider(api_key=api_key)
+
+
 class TranscriptionAgent:
     def __init__(
         self,
@@ -56,7 +91,7 @@ class TranscriptionAgent:
 
         _model = OpenAIChatModel(
             model,
-            provider=OpenRouterProvider(api_key=self.api_key),
+            provider=_get_provider(self.api_key),
         )
 
         self.agent = Agent(
@@ -72,13 +107,23 @@ class TranscriptionAgent:
         return result.output
 
     async def transcribe_from_file(self, file_path: str, prompt: str, *, model_settings: Optional[Dict[str, Any]] = None) -> str:
-        mime_type, _ = mimetypes.guess_type(file_path)
-        if not mime_type or not mime_type.startswith("audio/"):
+        mime_type = _AUDIO_MIME.get(os.path.splitext(file_path)[1].lower())
+        if mime_type is None:
             raise ValueError(f"File is not a valid audio file: {file_path}")
 
+        # Reject oversized files on a stat() instead of reading the whole
+        # file only for the API to refuse it.
+        size = os.path.getsize(file_path)
+        if size > AUDIO_MAX_BYTES:
+            raise ValueError(
+                f"Audio file too large ({size / (1024 * 1024):.1f} MB > "
+                f"{AUDIO_MAX_BYTES // (1024 * 1024)} MB): {file_path}"
+            )
+
         try:
-            with open(file_path, "rb") as f:
-                audio_data = f.read()
+            # Read off the event loop: a blocking read of a large recording
+            # would stall every other in-flight tool call.
+            audio_data = await asyncio.to_thread(FilePath(file_path).read_bytes)
         except IOError as e:
             raise ValueError(f"Failed to read audio file {file_path}: {str(e)}")
 
@@ -89,6 +134,45 @@ class TranscriptionAgent:
         return result.output
 
 
+@functools.lru_cache(maxsize=8)
+def _get_transcription_agent(model: str, system_prompt: Optional[str] = None) -> TranscriptionAgent:
+    """Reuse agents across calls: building one sets up the pydantic_ai Agent,
+    provider and HTTP client, all of which are stateless across run()."""
+    return TranscriptionAgent(model=model, system_prompt=system_prompt)
+
+
+def _dump(model: BaseModel) -> str:
+    # orjson's SIMD-accelerated escaping beats model_dump_json once the
+    # transcription field reaches MB sizes.
+    return orjson.dumps(model.model_dump()).decode()
+
+
+_DUMP_OFFLOAD_BYTES = 256 * 1024
+
+
+async def _dump_async(model: BaseModel) -> str:
+    """Like _dump, but serialized in a worker thread for large outputs.
+
+    Dumping a multi-MB string field takes long enough to stall other
+    responses sharing the event loop; small payloads stay on the fast
+    synchronous path.
+    """
+    data = model.model_dump()
+    if sum(len(value) for value in data.values() if isinstance(value, str)) > _DUMP_OFFLOAD_BYTES:
+        return await asyncio.to_thread(lambda: orjson.dumps(data).decode())
+    return orjson.dumps(data).decode()
+
+
+async def _result_cache_key(file_path: str, prompt: str, model: str, max_tokens: int) -> str:
+    """Cache key over input identity: URL as-is, local files by content
+    fingerprint so edits invalidate the entry."""
+    if file_path.startswith(("http://", "https://", "gs://")):
+        identity = file_path
+    else:
+        identity = await asyncio.to_thread(quick_fingerprint, file_path)
+    return hash_string(f"{identity}|{prompt}|{model}|{max_tokens}")
+
+
 mcp = FastMCP("audio-analysis", instructions=DESCRIPTION)
 
 
@@ -98,7 +182,7 @@ async def transcribe_audio(
     ctx: Context,
     prompt: Annotated[str, Field(description="Instruction for transcription")]
         = "Transcribe this audio file accurately, word-for-word.",
-    max_tokens: Annotated[int, Field(description="Max tokens for the model response")]
+    max_tokens: Annotated[int, Field(ge=1, le=16384, description="Max tokens for the model response")]
         = DEFAULT_AUDIO_MAX_TOKENS,  # <<< ДОБАВИЛИ
 ) -> str:
     """Transcribe a single audio file using Pydantic AI Agent.
@@ -117,8 +201,18 @@ async def transcribe_audio(
         - transcribe_audio("gs://bucket/audio.wav", prompt="Transcribe and summarize key points", max_tokens=1024)
     """
     try:
-        agent = TranscriptionAgent(model=DEFAULT_TRANSCRIPTION_MODEL)
-        model_settings = {"max_tokens": int(max_tokens)}  # <<< ДОБАВИЛИ
+        agent = _get_transcription_agent(DEFAULT_TRANSCRIPTION_MODEL)
+        model_settings = {"max_tokens": max_tokens}  # <<< ДОБАВИЛИ
+
+        # Identical inputs recur in agent workflows; a hit skips the full
+        # LLM round-trip and its cost.
+        cache_key = await _result_cache_key(
+            file_path, prompt, DEFAULT_TRANSCRIPTION_MODEL, max_tokens
+        )
+        cached = await cache_get(ROOT_CACHE, cache_key, collection=CACHE_COLLECTION)
+        if cached is not None:
+            await ctx.info("Using cached transcription")
+            return await _dump_async(TranscriptionOutput(transcription=cached["result"]))
 
         if file_path.startswith(("http://", "https://", "gs://")):
             await ctx.info("Transcribing audio from URL")
@@ -128,12 +222,72 @@ async def transcribe_audio(
             await ctx.info(f"Transcribing audio file: {file_name}")
             transcription = await agent.transcribe_from_file(file_path, prompt, model_settings=model_settings)
 
+        await cache_put(
+            ROOT_CACHE,
+            cache_key,
+            {"result": transcription},
+            collection=CACHE_COLLECTION,
+            ttl=RESULT_CACHE_TTL,
+        )
+
         await ctx.info("Transcription completed")
-        return TranscriptionOutput(transcription=transcription).model_dump_json()
+        return await _dump_async(TranscriptionOutput(transcription=transcription))
 
     except Exception as e:
         await ctx.error(f"Transcription failed: {str(e)}")
-        return TranscriptionOutput(error=str(e)).model_dump_json()
+        return _dump(TranscriptionOutput(error=str(e)))
+
+
+@mcp.tool
+async def transcribe_audio_batch(
+    file_paths: Annotated[List[str], Field(description="Paths or URLs of audio files")],
+    ctx: Context,
+    prompt: Annotated[str, Field(description="Instruction for transcription")]
+        = "Transcribe this audio file accurately, word-for-word.",
+    max_tokens: Annotated[int, Field(ge=1, le=16384, description="Max tokens for the model response")]
+        = DEFAULT_AUDIO_MAX_TOKENS,
+) -> str:
+    """Transcribe several audio files concurrently using one shared agent.
+
+    Sequential per-file tool calls pay sum(latencies); the batch runs them
+    with asyncio.gather bounded by MEDIA_BATCH_CONCURRENCY, so wall time is
+    close to the slowest file instead.
+
+    Args:
+        file_paths: Local paths or URLs of the audio files
+        prompt: Instruction for transcription (applied to every file)
+        max_tokens: Max tokens per response
+
+    Returns:
+        One TranscriptionOutput JSON object per line, in input order
+    """
+    try:
+        agent = _get_transcription_agent(DEFAULT_TRANSCRIPTION_MODEL)
+        model_settings = {"max_tokens": max_tokens}
+        semaphore = asyncio.Semaphore(MEDIA_BATCH_CONCURRENCY)
+
+        async def _transcribe_one(path: str) -> str:
+            async with semaphore:
+                if path.startswith(("http://", "https://", "gs://")):
+                    return await agent.transcribe_from_url(path, prompt, model_settings=model_settings)
+                return await agent.transcribe_from_file(path, prompt, model_settings=model_settings)
+
+        await ctx.info(f"Transcribing {len(file_paths)} audio files")
+        results = await asyncio.gather(
+            *(_transcribe_one(path) for path in file_paths), return_exceptions=True
+        )
+
+        await ctx.info("Batch transcription completed")
+        return "\n".join(
+            _dump(TranscriptionOutput(error=str(result)))
+            if isinstance(result, Exception)
+            else _dump(TranscriptionOutput(transcription=result))
+            for result in results
+        )
+
+    except Exception as e:
+        await ctx.error(f"Batch transcription failed: {str(e)}")
+        return _dump(TranscriptionOutput(error=str(e)))
 
 
 if __name__ == "__main__":
@@ -1,7 +1,11 @@
-import mimetypes
+import asyncio
+import functools
+import io
 import os
-from typing import Annotated, Optional, Dict, Any
+from pathlib import Path as FilePath
+from typing import Annotated, List, Optional, Dict, Any
 
+import orjson
 from dotenv import load_dotenv
 from fastmcp import Context, FastMCP
 from pydantic import BaseModel, Field
@@ -10,10 +14,65 @@ from pydantic_ai.messages import BinaryContent, ImageUrl
 from pydantic_ai.models.openai import OpenAIChatModel
 from pydantic_ai.providers.openrouter import OpenRouterProvider
 
+from automas.mcp.cache import ROOT_CACHE, cache_get, cache_put
+from automas.mcp.servers.content_utils import hash_string, quick_fingerprint
+
 load_dotenv()
 
 DEFAULT_VISION_MODEL = os.getenv("IMAGE_MODEL", "qwen/qwen2.5-vl-72b-instruct")
 DEFAULT_IMAGE_MAX_TOKENS = int(os.getenv("IMAGE_MAX_TOKENS", "1024"))  # <<< ДОБАВИЛИ
+MEDIA_BATCH_CONCURRENCY = int(os.getenv("MEDIA_BATCH_CONCURRENCY", "8"))
+IMAGE_MAX_BYTES = int(os.getenv("IMAGE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESULT_CACHE_TTL = int(os.getenv("MEDIA_RESULT_CACHE_TTL", "3600"))
+# Longest edge sent to the vision model; larger images are thumbnailed
+# and re-encoded as JPEG, same knob as the web screenshot server. Set to
+# 0 to send originals untouched.
+VISION_MAX_EDGE = int(os.getenv("VISION_MAX_EDGE", "1280"))
+
+CACHE_COLLECTION = "image_results"
+
+# The supported set is small and fixed (see DESCRIPTION), so a static
+# table avoids mimetypes' lazy system-file init and covers exactly the
+# formats the server accepts.
+_IMAGE_MIME = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".bmp": "image/bmp",
+    ".tiff": "image/tiff",
+    ".tif": "image/tiff",
+    ".svg": "image/svg+xml",
+    ".ico": "image/x-icon",
+}
+
+
+def _downscale_for_vision(image_data: bytes, mime_type: str) -> tuple[bytes, str]:
+    """Shrink an image to VISION_MAX_EDGE and re-encode as JPEG q80.
+
+    Vision models read text and structure fine at this size, and the
+    payload drops 5-10x versus a full-resolution PNG — less upload time
+    and fewer image tokens. Falls back to the original bytes for vector
+    or animated formats, images already within bounds, or anything
+    Pillow can't decode.
+    """
+    if VISION_MAX_EDGE <= 0 or mime_type in ("image/svg+xml", "image/gif"):
+        return image_data, mime_type
+    try:
+        from PIL import Image
+
+        image = Image.open(io.BytesIO(image_data))
+        if max(image.size) <= VISION_MAX_EDGE:
+            return image_data, mime_type
+        image.thumbnail((VISION_MAX_EDGE, VISION_MAX_EDGE), Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, "JPEG", quality=80, optimize=True)
+        if buffer.tell() < len(image_data):
+            return buffer.getvalue(), "image/jpeg"
+    except Exception:
+        pass
+    return image_data, mime_type
 
 
 class ImageAnalysisOutput(BaseModel):
@@ -21,6 +80,13 @@ class ImageAnalysisOutput(BaseModel):
     error: Optional[str] = Field(default=None, description="Error message if analysis failed")
 
 
+@functools.lru_cache(maxsize=4)
+def _get_provider(api_key: str) -> OpenRouterProvider:
+    """One provider per API key; agents then share its HTTP client instead
+    of constructing a provider (and connection pool) apiece."""
+    return OpenRouterProvider(api_key=api_key)
+
+
 class ImageAnalysisAgent:
     def __init__(
         self,
@@ -45,7 +111,7 @@ class ImageAnalysisAgent:
 
         _model = OpenAIChatModel(
             model,
-            provider=OpenRouterProvider(api_key=self.api_key),
+            provider=_get_provider(self.api_key),
         )
 
         self.agent = Agent(
@@ -76,16 +142,30 @@ class ImageAnalysisAgent:
         *,
         model_settings: Optional[Dict[str, Any]] = None,
     ) -> str:
-        mime_type, _ = mimetypes.guess_type(file_path)
-        if not mime_type or not mime_type.startswith("image/"):
+        mime_type = _IMAGE_MIME.get(os.path.splitext(file_path)[1].lower())
+        if mime_type is None:
             raise ValueError(f"File is not a valid image file: {file_path}")
 
+        # Reject oversized files on a stat() instead of reading the whole
+        # file only for the API to refuse it.
+        size = os.path.getsize(file_path)
+        if size > IMAGE_MAX_BYTES:
+            raise ValueError(
+                f"Image file too large ({size / (1024 * 1024):.1f} MB > "
+                f"{IMAGE_MAX_BYTES // (1024 * 1024)} MB): {file_path}"
+            )
+
         try:
-            with open(file_path, "rb") as f:
-                image_data = f.read()
+            # Read off the event loop so concurrent analyze/transcribe calls
+            # are not serialized behind disk I/O.
+            image_data = await asyncio.to_thread(FilePath(file_path).read_bytes)
         except IOError as e:
             raise ValueError(f"Failed to read image file {file_path}: {str(e)}")
 
+        image_data, mime_type = await asyncio.to_thread(
+            _downscale_for_vision, image_data, mime_type
+        )
+
         result = await self.agent.run(
             [prompt, BinaryContent(data=image_data, media_type=mime_type)],
             model_settings=model_settings,
@@ -98,11 +178,51 @@ Image analysis with LLM.
 
 Tools:
 - analyze_image: Analyze and describe a single image from local path or URL
+- analyze_image_batch: Analyze several images concurrently in one call
 
 Supported formats: .jpg, .jpeg, .png, .gif, .webp, .bmp, .tiff, .tif, .svg, .ico
 Supports Google Cloud Storage URIs (gs://)
 """
 
+
+@functools.lru_cache(maxsize=8)
+def _get_image_agent(model: str, system_prompt: Optional[str] = None) -> ImageAnalysisAgent:
+    """Reuse agents across calls; the pydantic_ai Agent is stateless across run()."""
+    return ImageAnalysisAgent(model=model, system_prompt=system_prompt)
+
+
+def _dump(model: BaseModel) -> str:
+    # orjson's SIMD-accelerated escaping beats model_dump_json on large
+    # analysis strings.
+    return orjson.dumps(model.model_dump()).decode()
+
+
+_DUMP_OFFLOAD_BYTES = 256 * 1024
+
+
+async def _dump_async(model: BaseModel) -> str:
+    """Like _dump, but serialized in a worker thread for large outputs.
+
+    Dumping a multi-MB string field takes long enough to stall other
+    responses sharing the event loop; small payloads stay on the fast
+    synchronous path.
+    """
+    data = model.model_dump()
+    if sum(len(value) for value in data.values() if isinstance(value, str)) > _DUMP_OFFLOAD_BYTES:
+        return await asyncio.to_thread(lambda: orjson.dumps(data).decode())
+    return orjson.dumps(data).decode()
+
+
+async def _result_cache_key(file_path: str, prompt: str, model: str, max_tokens: int) -> str:
+    """Cache key over input identity: URL as-is, local files by content
+    fingerprint so edits invalidate the entry."""
+    if file_path.startswith(("http://", "https://", "gs://")):
+        identity = file_path
+    else:
+        identity = await asyncio.to_thread(quick_fingerprint, file_path)
+    return hash_string(f"{identity}|{prompt}|{model}|{max_tokens}")
+
+
 mcp = FastMCP("image-analysis", instructions=DESCRIPTION)
 
 
@@ -114,7 +234,7 @@ async def analyze_image(
         str, Field(description="Question or prompt about the image")
     ] = "What's in this image? Describe it in detail.",
     max_tokens: Annotated[
-        int, Field(description="Maximum number of tokens for the model response")
+        int, Field(ge=1, le=16384, description="Maximum number of tokens for the model response")
     ] = DEFAULT_IMAGE_MAX_TOKENS,  # <<< ДОБАВИЛИ
 ) -> str:
     """Analyze and describe a single image using Pydantic AI Agent.
@@ -128,8 +248,16 @@ async def analyze_image(
         JSON string with analysis result
     """
     try:
-        agent = ImageAnalysisAgent()
-        model_settings = {"max_tokens": int(max_tokens)}  # <<< КЛЮЧЕВО
+        agent = _get_image_agent(DEFAULT_VISION_MODEL)
+        model_settings = {"max_tokens": max_tokens}  # <<< КЛЮЧЕВО
+
+        # Identical inputs recur in agent workflows; a hit skips the full
+        # LLM round-trip and its cost.
+        cache_key = await _result_cache_key(file_path, prompt, DEFAULT_VISION_MODEL, max_tokens)
+        cached = await cache_get(ROOT_CACHE, cache_key, collection=CACHE_COLLECTION)
+        if cached is not None:
+            await ctx.info("Using cached analysis")
+            return await _dump_async(ImageAnalysisOutput(analysis=cached["result"]))
 
         if file_path.startswith(("http://", "https://", "gs://")):
             await ctx.info("Analyzing image from URL")
@@ -147,12 +275,74 @@ async def analyze_image(
                 model_settings=model_settings,
             )
 
+        await cache_put(
+            ROOT_CACHE,
+            cache_key,
+            {"result": analysis},
+            collection=CACHE_COLLECTION,
+            ttl=RESULT_CACHE_TTL,
+        )
+
         await ctx.info("Analysis completed")
-        return ImageAnalysisOutput(analysis=analysis).model_dump_json()
+        return await _dump_async(ImageAnalysisOutput(analysis=analysis))
 
     except Exception as e:
         await ctx.error(f"Analysis failed: {str(e)}")
-        return ImageAnalysisOutput(error=str(e)).model_dump_json()
+        return _dump(ImageAnalysisOutput(error=str(e)))
+
+
+@mcp.tool
+async def analyze_image_batch(
+    file_paths: Annotated[List[str], Field(description="Paths or URLs of image files")],
+    ctx: Context,
+    prompt: Annotated[
+        str, Field(description="Question or prompt about the images")
+    ] = "What's in this image? Describe it in detail.",
+    max_tokens: Annotated[
+        int, Field(ge=1, le=16384, description="Maximum number of tokens for the model response")
+    ] = DEFAULT_IMAGE_MAX_TOKENS,
+) -> str:
+    """Analyze several images concurrently using one shared agent.
+
+    Runs the analyses with asyncio.gather bounded by
+    MEDIA_BATCH_CONCURRENCY, so wall time tracks the slowest image rather
+    than the sum of per-image calls.
+
+    Args:
+        file_paths: Local paths or URLs of the image files
+        prompt: Question or prompt applied to every image
+        max_tokens: Max tokens per response
+
+    Returns:
+        One ImageAnalysisOutput JSON object per line, in input order
+    """
+    try:
+        agent = _get_image_agent(DEFAULT_VISION_MODEL)
+        model_settings = {"max_tokens": max_tokens}
+        semaphore = asyncio.Semaphore(MEDIA_BATCH_CONCURRENCY)
+
+        async def _analyze_one(path: str) -> str:
+            async with semaphore:
+                if path.startswith(("http://", "https://", "gs://")):
+                    return await agent.analyze_from_url(path, prompt, model_settings=model_settings)
+                return await agent.analyze_from_file(path, prompt, model_settings=model_settings)
+
+        await ctx.info(f"Analyzing {len(file_paths)} images")
+        results = await asyncio.gather(
+            *(_analyze_one(path) for path in file_paths), return_exceptions=True
+        )
+
+        await ctx.info("Batch analysis completed")
+        return "\n".join(
+            _dump(ImageAnalysisOutput(error=str(result)))
+            if isinstance(result, Exception)
+            else _dump(ImageAnalysisOutput(analysis=result))
+            for result in results
+        )
+
+    except Exception as e:
+        await ctx.error(f"Batch analysis failed: {str(e)}")
+        return _dump(ImageAnalysisOutput(error=str(e)))
 
 
 if __name__ == "__main__":
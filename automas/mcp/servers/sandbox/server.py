@@ -1,5 +1,11 @@
+import asyncio
+import gzip
 import os
-from typing import Annotated, Dict, Optional
+import shlex
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Annotated, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 from e2b_code_interpreter import AsyncSandbox, CommandResult, Execution
@@ -17,7 +23,8 @@ and computational tasks without affecting the local system.
 
 Available tools:
 - e2b_create_sandbox_and_return_id: Create a new sandbox instance
-- e2b_upload_file: Upload local files to the sandbox
+- e2b_upload_file: Upload a local file to the sandbox
+- e2b_upload_files: Upload several local files to the sandbox in one call
 - e2b_download_file: Download files from the sandbox to local system
 - e2b_run_code: Execute Python code in a sandbox environment
 - e2b_run_command: Run shell commands (install packages, file operations, system utilities)
@@ -65,7 +72,64 @@ class SandboxError(BaseModel):
     code_snippet: Optional[str] = Field(default=None, description="Code snippet if relevant")
 
 
-_sandbox_instances: Dict[str, AsyncSandbox] = {}
+# Bounded TTL LRU of live sandbox handles. The old plain dict never
+# evicted, so a long-running server accumulated sandbox handles (and their
+# sockets) forever and placed no cap on concurrent sandboxes.
+_SANDBOX_CACHE_MAX = int(os.getenv("E2B_MAX_SANDBOXES", "32"))
+_SANDBOX_TTL_SECONDS = int(os.getenv("E2B_SANDBOX_TTL", "1800"))
+_sandbox_instances: "OrderedDict[str, Tuple[AsyncSandbox, float]]" = OrderedDict()
+
+# Per-id locks so two concurrent calls for the same sandbox_id don't both
+# run AsyncSandbox.connect and cache-clobber one of the handles.
+_sandbox_locks: Dict[str, asyncio.Lock] = {}
+
+# Optional E2B template id/name for new sandboxes. Pointing this at a
+# snapshot with pandas/numpy preinstalled removes the multi-second
+# pip-install cold start every data task otherwise pays.
+_SANDBOX_TEMPLATE = os.getenv("E2B_TEMPLATE") or None
+
+# Uploads above this size are gzipped on the wire and decompressed inside
+# the sandbox; text formats like CSV typically shrink 3-5x. Below it the
+# extra decompress round trip costs more than the bytes saved.
+_UPLOAD_COMPRESS_MIN_BYTES = int(os.getenv("E2B_UPLOAD_COMPRESS_MIN", str(1024 * 1024)))
+
+
+async def _kill_sandbox_quietly(sandbox: AsyncSandbox) -> None:
+    try:
+        await sandbox.kill()
+    except Exception:
+        pass
+
+
+def _cached_sandbox(sandbox_id: str) -> Optional[AsyncSandbox]:
+    entry = _sandbox_instances.get(sandbox_id)
+    if entry is None:
+        return None
+
+    sandbox, expires_at = entry
+    if expires_at <= time.monotonic():
+        # Stale handle: drop it without killing, the caller is about to
+        # reconnect to the same sandbox_id.
+        del _sandbox_instances[sandbox_id]
+        return None
+
+    _sandbox_instances.move_to_end(sandbox_id)
+    return sandbox
+
+
+def _cache_sandbox(sandbox: AsyncSandbox) -> None:
+    now = time.monotonic()
+
+    expired = [sid for sid, (_, expires_at) in _sandbox_instances.items() if expires_at <= now]
+    for sid in expired:
+        old, _ = _sandbox_instances.pop(sid)
+        asyncio.create_task(_kill_sandbox_quietly(old))
+
+    while len(_sandbox_instances) >= _SANDBOX_CACHE_MAX:
+        _, (old, _) = _sandbox_instances.popitem(last=False)
+        asyncio.create_task(_kill_sandbox_quietly(old))
+
+    _sandbox_instances[sandbox.sandbox_id] = (sandbox, now + _SANDBOX_TTL_SECONDS)
 
 
 async def get_sandbox(sandbox_id: Optional[str] = None) -> AsyncSandbox:
@@ -74,16 +138,28 @@ async def get_sandbox(sandbox_id: Optional[str] = None) -> AsyncSandbox:
     if not api_key:
         raise RuntimeError("E2B_API_KEY environment variable not set")
 
-    if sandbox_id and sandbox_id in _sandbox_instances:
-        return _sandbox_instances[sandbox_id]
-
     try:
         if sandbox_id:
-            sandbox = await AsyncSandbox.connect(sandbox_id, api_key=api_key)
+            # Double-checked per-id lock: only the first of N concurrent
+            # callers pays the connect round-trip, the rest reuse its handle.
+            # Without an id each call intentionally creates a fresh sandbox,
+            # so there is nothing to serialize.
+            lock = _sandbox_locks.setdefault(sandbox_id, asyncio.Lock())
+            async with lock:
+                cached = _cached_sandbox(sandbox_id)
+                if cached is not None:
+                    return cached
+
+                sandbox = await AsyncSandbox.connect(sandbox_id, api_key=api_key)
+                _cache_sandbox(sandbox)
+            _sandbox_locks.pop(sandbox_id, None)
         else:
-            sandbox = await AsyncSandbox.create(api_key=api_key)
+            if _SANDBOX_TEMPLATE:
+                sandbox = await AsyncSandbox.create(template=_SANDBOX_TEMPLATE, api_key=api_key)
+            else:
+                sandbox = await AsyncSandbox.create(api_key=api_key)
+            _cache_sandbox(sandbox)
 
-        _sandbox_instances[sandbox.sandbox_id] = sandbox
         return sandbox
 
     except Exception as e:
@@ -127,8 +203,25 @@ async def e2b_upload_file(
         if destination_path is None:
             destination_path = os.path.basename(path)
 
-        with open(path, "rb") as file:
-            remote_file = await sandbox.files.write(destination_path, file)
+        # Read in a worker thread: a synchronous open/read of a large upload
+        # would block the event loop for every other sandbox call.
+        data = await asyncio.to_thread(Path(path).read_bytes)
+
+        if len(data) >= _UPLOAD_COMPRESS_MIN_BYTES:
+            compressed = await asyncio.to_thread(gzip.compress, data, 5)
+            # Only take the compressed path when it actually pays for the
+            # extra decompress round trip; already-compressed formats won't.
+            if len(compressed) < len(data) * 0.9:
+                remote_file = await sandbox.files.write(destination_path + ".gz", compressed)
+                await sandbox.commands.run(f"gunzip -f {shlex.quote(remote_file.path)}")
+                final_path = remote_file.path[: -len(".gz")]
+                await ctx.info(
+                    f"File uploaded to: {final_path} "
+                    f"(gzip {len(data)} -> {len(compressed)} bytes on the wire)"
+                )
+                return FileUploadResult(e2b_file_path=final_path, sandbox_id=sandbox_id)
+
+        remote_file = await sandbox.files.write(destination_path, data)
 
         await ctx.info(f"File uploaded to: {remote_file.path}")
         return FileUploadResult(e2b_file_path=remote_file.path, sandbox_id=sandbox_id)
@@ -142,6 +235,47 @@ async def e2b_upload_file(
         )
 
 
+@mcp.tool
+async def e2b_upload_files(
+    paths: Annotated[List[str], Field(description="Local file paths to upload")],
+    ctx: Context,
+    sandbox_id: Annotated[str, Field(description="Sandbox ID to upload to.")],
+) -> List[FileUploadResult] | SandboxError:
+    """Upload several local files to an E2B sandbox in a single request.
+
+    The files are read concurrently and written with one batched
+    files.write call, so a multi-file task pays one upload round trip
+    instead of one per file. Each file keeps its local basename.
+    """
+    try:
+        await ctx.info(f"Uploading {len(paths)} files")
+
+        sandbox = await get_sandbox(sandbox_id)
+
+        contents = await asyncio.gather(
+            *(asyncio.to_thread(Path(path).read_bytes) for path in paths)
+        )
+        entries = [
+            {"path": os.path.basename(path), "data": data}
+            for path, data in zip(paths, contents)
+        ]
+        remote_files = await sandbox.files.write(entries)
+
+        await ctx.info(f"Uploaded {len(remote_files)} files")
+        return [
+            FileUploadResult(e2b_file_path=remote.path, sandbox_id=sandbox_id)
+            for remote in remote_files
+        ]
+    except Exception as e:
+        await ctx.error(f"Failed to upload files: {e}")
+        return SandboxError(
+            error=f"Failed to upload files: {e}",
+            operation="upload",
+            sandbox_id=sandbox_id,
+            file_path=", ".join(paths),
+        )
+
+
 @mcp.tool
 async def e2b_run_code(
     code_block: Annotated[str, Field(description="The Python code to execute")],
@@ -183,9 +317,10 @@ async def e2b_download_file(
 
         sandbox = await get_sandbox(sandbox_id)
         file_content = await sandbox.files.read(sandbox_path)
+        if isinstance(file_content, str):
+            file_content = file_content.encode("utf-8")
 
-        with open(local_path, "wb") as f:
-            f.write(file_content)
+        await asyncio.to_thread(Path(local_path).write_bytes, file_content)
 
         await ctx.info(f"File downloaded to: {local_path}")
         return FileDownloadResult(
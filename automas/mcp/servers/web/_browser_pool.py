@@ -0,0 +1,88 @@
+"""Shared Playwright browser pool for single-URL web tools.
+
+Spinning up a PlaywrightCrawler per tool call pays a full Chromium launch
+(process fork, profile setup, DevTools handshake) for every screenshot.
+This module keeps a small pool of warm Browser instances behind an
+asyncio.Queue; callers borrow one, get a fresh isolated BrowserContext,
+and return the browser when done. Browsers are recycled after a fixed
+number of uses to bound memory growth from long-lived renderer processes.
+"""
+
+import asyncio
+import contextlib
+import os
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "4"))
+MAX_USES_PER_INSTANCE = int(os.getenv("BROWSER_POOL_MAX_USES", "100"))
+
+_LAUNCH_ARGS = [
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+]
+
+_playwright: Optional[Playwright] = None
+_queue: Optional["asyncio.Queue[Optional[Browser]]"] = None
+_use_counts: Dict[int, int] = {}
+
+
+def _get_queue() -> "asyncio.Queue[Optional[Browser]]":
+    global _queue
+    if _queue is None:
+        _queue = asyncio.Queue()
+        # Seed with placeholders: browsers launch lazily on first acquire,
+        # so an idle server never forks Chromium at all.
+        for _ in range(BROWSER_POOL_SIZE):
+            _queue.put_nowait(None)
+    return _queue
+
+
+async def _launch() -> Browser:
+    global _playwright
+    if _playwright is None:
+        _playwright = await async_playwright().start()
+    return await _playwright.chromium.launch(headless=True, args=_LAUNCH_ARGS)
+
+
+@contextlib.asynccontextmanager
+async def acquire() -> AsyncIterator[Tuple[Browser, BrowserContext]]:
+    """Borrow a pooled browser and a fresh context for it.
+
+    Blocks until one of the pool's slots is free, so at most
+    BROWSER_POOL_SIZE browsers run concurrently. The context is closed on
+    exit; the browser goes back to the pool unless it has hit
+    MAX_USES_PER_INSTANCE or lost its connection, in which case the slot is
+    returned empty and the next acquire launches a replacement.
+    """
+    queue = _get_queue()
+    browser = await queue.get()
+    try:
+        if browser is not None and (
+            not browser.is_connected()
+            or _use_counts.get(id(browser), 0) >= MAX_USES_PER_INSTANCE
+        ):
+            _use_counts.pop(id(browser), None)
+            with contextlib.suppress(Exception):
+                await browser.close()
+            browser = None
+
+        if browser is None:
+            browser = await _launch()
+
+        _use_counts[id(browser)] = _use_counts.get(id(browser), 0) + 1
+
+        context = await browser.new_context()
+        try:
+            yield browser, context
+        finally:
+            with contextlib.suppress(Exception):
+                await context.close()
+    finally:
+        if browser is not None and browser.is_connected():
+            queue.put_nowait(browser)
+        else:
+            queue.put_nowait(None)
@@ -1,19 +1,106 @@
+import asyncio
+import base64
+import io
 import os
-from typing import Annotated
+from typing import Annotated, List
 
-from crawlee.crawlers import PlaywrightCrawler, PlaywrightCrawlingContext
 from crawlee.storages import KeyValueStore
+from PIL import Image
 from dotenv import load_dotenv
 from fastmcp import Context, FastMCP
-from markitdown import MarkItDown
 from openai import OpenAI
 from pydantic import AnyUrl, Field
 
+from automas.mcp.cache import ROOT_CACHE, cache_get, cache_put
+from automas.mcp.servers.content_utils import hash_string
+from automas.mcp.servers.web import _browser_pool
+
 load_dotenv()
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
 IMAGE_MODEL = os.getenv("IMAGE_MODEL", "google/gemini-2.5-flash")
 
+# Pages change slowly relative to how often agents re-ask about them; both
+# the raw capture and the vision verdict keep for a week, matching the
+# web_content cache in server.py.
+SCREENSHOT_CACHE_TTL = 604800  # 7 days
+
+# Vision models downscale internally anyway; sending a full-resolution
+# full-page PNG just inflates upload time and image-token cost. 0 disables
+# the downscale and ships the raw PNG.
+VISION_MAX_EDGE = int(os.getenv("VISION_MAX_EDGE", "1280"))
+
+
+_kvs: KeyValueStore | None = None
+_kvs_lock = asyncio.Lock()
+
+
+async def _get_kvs() -> KeyValueStore:
+    """Open the default KeyValueStore once; every call paid Crawlee's
+    storage-client bookkeeping otherwise. The lock keeps concurrent tool
+    invocations from double-opening."""
+    global _kvs
+    if _kvs is None:
+        async with _kvs_lock:
+            if _kvs is None:
+                _kvs = await KeyValueStore.open()
+    return _kvs
+
+
+_openai_client: OpenAI | None = None
+
+
+def _get_openai() -> OpenAI:
+    """Process-wide OpenRouter client; per-call construction rebuilt the
+    connection pool and re-read env/TLS setup for every analysis."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = OpenAI(
+            base_url="https://openrouter.ai/api/v1",
+            api_key=OPENROUTER_API_KEY,
+            max_retries=2,
+        )
+    return _openai_client
+
+
+def _downscale_for_vision(png_bytes: bytes) -> tuple[bytes, str]:
+    """Re-encode a capture for the vision model: bounded edge, JPEG.
+
+    Returns the encoded bytes and the matching file extension. CPU-bound,
+    call via asyncio.to_thread.
+    """
+    if VISION_MAX_EDGE <= 0:
+        return png_bytes, ".png"
+
+    image = Image.open(io.BytesIO(png_bytes))
+    if max(image.size) > VISION_MAX_EDGE:
+        image.thumbnail((VISION_MAX_EDGE, VISION_MAX_EDGE), Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    image.convert("RGB").save(buffer, format="JPEG", quality=80, optimize=True)
+    return buffer.getvalue(), ".jpg"
+
+
+async def _capture(url: str, block_media: bool = False) -> bytes:
+    """Render a page on a pooled browser and return its full-page PNG.
+
+    networkidle catches late-loading content that a bare load event would
+    miss; the 30s cap keeps a stalled page from pinning a pool slot.
+    block_media aborts video/audio requests — they never appear in a still
+    capture, so the save-only path skips their transfer entirely.
+    """
+    async with _browser_pool.acquire() as (_, browser_context):
+        page = await browser_context.new_page()
+        if block_media:
+            await page.route(
+                "**/*",
+                lambda route: route.abort()
+                if route.request.resource_type == "media"
+                else route.continue_(),
+            )
+        await page.goto(url, wait_until="networkidle", timeout=30_000)
+        return await page.screenshot(full_page=True)
+
 
 screenshot_server = FastMCP("screenshot")
 
@@ -35,38 +122,22 @@ async def screenshot_and_save(
 
     Returns:
         Success message if screenshot was captured, error message otherwise.
-        Checks crawler statistics to ensure the request succeeded before reporting success.
     """
     try:
         await ctx.info(f"Capturing screenshot: {filename}")
 
-        crawler = PlaywrightCrawler(
-            max_requests_per_crawl=10,
-            headless=True,
-            browser_type="chromium",
-            browser_launch_options={"args": ["--no-sandbox", "--disable-setuid-sandbox"]},
-        )
-
-        kvs = await KeyValueStore.open()
+        kvs = await _get_kvs()
 
-        @crawler.router.default_handler
-        async def request_handler(context: PlaywrightCrawlingContext) -> None:
-            screenshot = await context.page.screenshot()
-            name = context.request.url.split("/")[-1]
+        # Single-URL job: borrow a warm pooled browser instead of paying a
+        # full Chromium launch through PlaywrightCrawler.
+        screenshot = await _capture(str(url), block_media=True)
 
-            await kvs.set_value(
-                key=f"screenshot-{name}",
-                value=screenshot,
-                content_type="image/png",
-            )
-
-        stats = await crawler.run([str(url)])
-
-        if stats.requests_failed > 0:
-            await ctx.error(
-                f"Failed to capture screenshot: {stats.requests_failed} request(s) failed"
-            )
-            return f"Error: Failed to capture screenshot for {url} ({stats.requests_failed} failed, {stats.requests_finished} succeeded)"
+        name = str(url).split("/")[-1]
+        await kvs.set_value(
+            key=f"screenshot-{name}",
+            value=screenshot,
+            content_type="image/png",
+        )
 
         await ctx.info("Screenshot saved")
         return f"Screenshot saved for {url}"
@@ -75,6 +146,47 @@ async def screenshot_and_save(
         return f"Error: {str(e)} (source: {url})"
 
 
+@screenshot_server.tool
+async def screenshot_many(
+    urls: Annotated[List[str], Field(description="URLs of the web pages")],
+    ctx: Context,
+) -> List[str]:
+    """Capture screenshots of several web pages concurrently.
+
+    Captures run with asyncio.gather; concurrency is naturally bounded by
+    the browser pool, so a list of URLs costs roughly the slowest render
+    instead of the sum. Each screenshot lands in the KeyValueStore under
+    'screenshot-{last URL segment}', same as screenshot_and_save.
+
+    Args:
+        urls: The URLs of the web pages to screenshot
+
+    Returns:
+        One status message per URL, in input order
+    """
+    kvs = await _get_kvs()
+
+    async def _capture_one(one_url: str) -> str:
+        screenshot = await _capture(one_url, block_media=True)
+        # _capture has already released its pool slot here, so the KVS
+        # write overlaps the other in-flight captures instead of blocking
+        # a browser the way the old in-handler write did.
+        name = one_url.split("/")[-1]
+        await kvs.set_value(
+            key=f"screenshot-{name}",
+            value=screenshot,
+            content_type="image/png",
+        )
+        return f"Screenshot saved for {one_url}"
+
+    await ctx.info(f"Capturing {len(urls)} screenshots")
+    results = await asyncio.gather(*(_capture_one(u) for u in urls), return_exceptions=True)
+    return [
+        f"Error: {result} (source: {one_url})" if isinstance(result, Exception) else result
+        for one_url, result in zip(urls, results)
+    ]
+
+
 @screenshot_server.tool
 async def screenshot_and_analyze(
     url: Annotated[AnyUrl, Field(description="URL of the web page")],
@@ -85,12 +197,12 @@ async def screenshot_and_analyze(
     """Capture a screenshot of a web page and analyze it using LLM vision capabilities.
 
     This tool combines screenshot capture with AI-powered visual analysis. It uses Playwright
-    to capture the screenshot, saves it temporarily to .cache/, then uses MarkItDown with
-    a vision-capable LLM to analyze the image.
+    to capture the screenshot, then sends the image in-memory to a vision-capable LLM
+    for analysis.
 
     Args:
         url: The URL of the web page to screenshot and analyze
-        filename: Name for the temporary screenshot file (saved in .cache/)
+        filename: Label for the screenshot, used in log messages
         prompt: Custom analysis prompt to guide the LLM's interpretation of the screenshot
 
     Returns:
@@ -99,40 +211,67 @@ async def screenshot_and_analyze(
     try:
         await ctx.info(f"Capturing and analyzing screenshot: {filename}")
 
-        crawler = PlaywrightCrawler(
-            max_requests_per_crawl=1,
-            headless=True,
-            browser_type="chromium",
-            browser_launch_options={"args": ["--no-sandbox", "--disable-setuid-sandbox"]},
-        )
+        # The analysis is deterministic in (page, model, prompt); a hit
+        # skips both the browser render and the vision round-trip.
+        analysis_key = hash_string(f"{url}|{IMAGE_MODEL}|{prompt}")
+        cached_analysis = await cache_get(ROOT_CACHE, analysis_key, collection="vision_analysis")
+        if cached_analysis is not None:
+            await ctx.info("Using cached screenshot analysis")
+            return cached_analysis["result"]
 
-        screenshot_path = None
+        # Second-level cache: same page, different prompt still reuses the
+        # rendered pixels.
+        screenshot_key = hash_string(str(url))
+        cached_png = await cache_get(ROOT_CACHE, screenshot_key, collection="screenshot_png")
+        if cached_png is not None:
+            screenshot = base64.b64decode(cached_png["png_b64"])
+        else:
+            screenshot = await _capture(str(url))
 
-        @crawler.router.default_handler
-        async def request_handler(context: PlaywrightCrawlingContext) -> None:
-            nonlocal screenshot_path
-            screenshot = await context.page.screenshot()
-            temp_path = f".cache/{filename}.png"
-            os.makedirs(".cache", exist_ok=True)
-            with open(temp_path, "wb") as f:
-                f.write(screenshot)
-            screenshot_path = temp_path
+            await cache_put(
+                ROOT_CACHE,
+                screenshot_key,
+                {"png_b64": base64.b64encode(screenshot).decode("ascii")},
+                collection="screenshot_png",
+                ttl=SCREENSHOT_CACHE_TTL,
+            )
 
-        stats = await crawler.run([str(url)])
+        if OPENROUTER_API_KEY:
+            await ctx.info("Analyzing screenshot with vision model")
 
-        if stats.requests_failed > 0:
-            await ctx.error(
-                f"Failed to capture screenshot: {stats.requests_failed} request(s) failed"
+            # The bytes never touch disk: downscale in memory, ship as a
+            # data URI straight to the chat completions endpoint. The old
+            # .cache/*.png round-trip cost a blocking write plus a re-read
+            # and left orphaned files behind.
+            vision_bytes, extension = await asyncio.to_thread(_downscale_for_vision, screenshot)
+            mime_type = "image/jpeg" if extension == ".jpg" else "image/png"
+            data_uri = (
+                f"data:{mime_type};base64,{base64.b64encode(vision_bytes).decode('ascii')}"
             )
-            return f"Error: Failed to capture screenshot for {url} ({stats.requests_failed} failed, {stats.requests_finished} succeeded)"
 
-        if screenshot_path and OPENROUTER_API_KEY:
-            await ctx.info("Analyzing screenshot with vision model")
-            client = OpenAI(base_url="https://openrouter.ai/api/v1", api_key=OPENROUTER_API_KEY)
-            md = MarkItDown(llm_client=client, llm_model=IMAGE_MODEL, llm_prompt=prompt)
-            result = md.convert(screenshot_path)
+            completion = await asyncio.to_thread(
+                _get_openai().chat.completions.create,
+                model=IMAGE_MODEL,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {"type": "text", "text": prompt},
+                            {"type": "image_url", "image_url": {"url": data_uri}},
+                        ],
+                    }
+                ],
+            )
+            analysis = completion.choices[0].message.content or ""
+            await cache_put(
+                ROOT_CACHE,
+                analysis_key,
+                {"result": analysis},
+                collection="vision_analysis",
+                ttl=SCREENSHOT_CACHE_TTL,
+            )
             await ctx.info("Screenshot analysis completed")
-            return result.text_content
+            return analysis
 
         await ctx.info("Screenshot captured (analysis unavailable)")
         return "Screenshot captured but analysis not available (missing API key)"
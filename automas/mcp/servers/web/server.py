@@ -1,13 +1,19 @@
 import asyncio
+import hashlib
+import os
 from pathlib import Path
-from typing import Annotated, Optional
+from typing import Annotated, Any, Dict, List, Optional, Tuple
 
 import requests
-from crawlee.crawlers import PlaywrightCrawler, PlaywrightCrawlingContext
+from crawlee.crawlers import (
+    AdaptivePlaywrightCrawler,
+    AdaptivePlaywrightCrawlingContext,
+    AdaptivePlaywrightPreNavCrawlingContext,
+)
 from crawlee.storage_clients.models import DatasetItemsListPage
-from crawlee.storages import Dataset
 from dotenv import load_dotenv
 from fastmcp import Context, FastMCP
+import markdownify
 from markitdown import MarkItDown
 from pydantic import AnyUrl, Field
 
@@ -20,6 +26,33 @@ load_dotenv()
 CACHE_DIR = Path.home() / ".automas" / "web_cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Module-level session so repeated extract() calls reuse pooled keep-alive
+# connections instead of rebuilding the session and header set each time.
+_SESSION = requests.Session()
+_SESSION.headers.update(
+    {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "gzip, deflate, br",
+        "DNT": "1",
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1",
+        "Sec-Fetch-Dest": "document",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-Site": "none",
+        "Sec-Fetch-User": "?1",
+        "Cache-Control": "max-age=0",
+    }
+)
+
+
+CACHE_TTL = 604800  # 7 days
+
+# Bound on concurrent extract_many fetches; conversions share the session
+# pool, so past this point extra parallelism only thrashes.
+EXTRACT_CONCURRENCY = int(os.getenv("WEB_EXTRACT_CONCURRENCY", "8"))
+
 
 async def try_fetch_from_cache(url: str) -> Optional[str]:
     """Fetch cached web content if available."""
@@ -32,16 +65,56 @@ async def try_fetch_from_cache(url: str) -> Optional[str]:
     return None
 
 
-async def write_to_cache(url: str, content: str) -> None:
-    """Cache web content with 7-day TTL."""
+async def write_to_cache(url: str, content: str, content_hash: Optional[str] = None) -> None:
+    """Cache web content with 7-day TTL.
+
+    Besides the URL key, the markdown is also stored under its body hash so
+    mirrors of the same document (or the same page behind different
+    tracking params) hit the cache on their first visit.
+    """
     key = hash_string(url)
     await cache_put(
         CACHE_DIR,
         key=key,
         value={"content": content},
         collection="web_content",
-        ttl=604800,  # 7 days
+        ttl=CACHE_TTL,
     )
+    if content_hash:
+        await cache_put(
+            CACHE_DIR,
+            key=f"content:{content_hash}",
+            value={"content": content},
+            collection="web_content",
+            ttl=CACHE_TTL,
+        )
+
+
+def _fetch(url: str, validators: Optional[Dict[str, Any]]) -> Tuple[Optional[requests.Response], Dict[str, Any]]:
+    """GET the page, conditionally when we hold validators for it.
+
+    Returns (response, validators). A 304 returns (None, old_validators):
+    the body is unchanged, so the caller can reuse the markdown stored
+    under the old content hash without re-downloading or re-converting.
+    """
+    headers: Dict[str, str] = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    response = _SESSION.get(url, headers=headers or None)
+    if response.status_code == 304 and validators:
+        return None, validators
+    response.raise_for_status()
+
+    content_hash = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+    return response, {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "content_hash": content_hash,
+    }
 
 
 DESCRIPTION = """
@@ -51,6 +124,7 @@ Web research and data collection toolkit.
 and specialized engines - providing comprehensive coverage
 - extract: Convert any web page or document URL to clean Markdown
 (supports HTML, PDF, etc.) Use this when you need the actual content of a specific URL
+- extract_many: Convert several URLs to Markdown concurrently in one call
 - map: Generate site map by discovering all pages within a domain
   Use this to explore website structure, then use 'extract' on specific pages
 - screenshot_and_save: Capture webpage screenshots
@@ -89,47 +163,142 @@ async def extract(
         - extract("https://example.com/document.pdf")
     """
     try:
-        markdown_content = await try_fetch_from_cache(str(url))
+        # Derived-output cache: for a huge document with a small max_lines,
+        # a hit skips re-truncating the full markdown and never pulls the
+        # big blob out of the content cache at all.
+        trunc_key = None
+        if max_lines is not None:
+            trunc_key = hash_string(f"{url}|lines={max_lines}")
+            cached = await cache_get(CACHE_DIR, key=trunc_key, collection="web_content_trunc")
+            if cached and "content" in cached:
+                await ctx.info("Content retrieved from cache")
+                return cached["content"]
+
+        markdown_content = await _extract_markdown(str(url), ctx)
+        markdown_content = truncate_text(markdown_content, max_lines)
 
-        if not markdown_content:
-            await ctx.info("Extracting content from URL")
-
-            def _convert():
-                session = requests.Session()
-                session.headers.update(
-                    {
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-                        "Accept-Language": "en-US,en;q=0.9",
-                        "Accept-Encoding": "gzip, deflate, br",
-                        "DNT": "1",
-                        "Connection": "keep-alive",
-                        "Upgrade-Insecure-Requests": "1",
-                        "Sec-Fetch-Dest": "document",
-                        "Sec-Fetch-Mode": "navigate",
-                        "Sec-Fetch-Site": "none",
-                        "Sec-Fetch-User": "?1",
-                        "Cache-Control": "max-age=0",
-                    }
-                )
-                md = MarkItDown(requests_session=session)
-                result = md.convert(str(url))
-                return result.text_content
-
-            markdown_content = await asyncio.to_thread(_convert)
-
-            await write_to_cache(str(url), markdown_content)
-            await ctx.info("Content extracted successfully")
-        else:
-            await ctx.info("Content retrieved from cache")
+        if trunc_key is not None:
+            # Short TTL: this is derived from the 7-day raw cache and cheap
+            # to rebuild.
+            await cache_put(
+                CACHE_DIR,
+                key=trunc_key,
+                value={"content": markdown_content},
+                collection="web_content_trunc",
+                ttl=86400,
+            )
 
-        markdown_content = truncate_text(markdown_content, max_lines)
         return markdown_content
     except Exception as e:
         await ctx.error(f"Content extraction failed: {e}")
         return str(e)
 
 
+async def _extract_markdown(url: str, ctx: Context) -> str:
+    """Fetch a page and return its full markdown, consulting the caches."""
+    markdown_content = await try_fetch_from_cache(url)
+
+    if not markdown_content:
+        await ctx.info("Extracting content from URL")
+
+        url_key = hash_string(url)
+        validators = await cache_get(CACHE_DIR, key=url_key, collection="web_validators")
+
+        response, validators = await asyncio.to_thread(_fetch, url, validators)
+        if response is None:
+            # 304: the body hasn't changed, reuse the markdown stored
+            # under its content hash.
+            cached = await cache_get(
+                CACHE_DIR,
+                key=f"content:{validators['content_hash']}",
+                collection="web_content",
+            )
+            if cached and "content" in cached:
+                markdown_content = cached["content"]
+            else:
+                # Validators outlived the content entry; fetch for real.
+                response, validators = await asyncio.to_thread(_fetch, url, None)
+
+        if not markdown_content:
+            # Secondary probe: a mirror or tracking-param variant of a
+            # page we already converted shares its body hash.
+            cached = await cache_get(
+                CACHE_DIR,
+                key=f"content:{validators['content_hash']}",
+                collection="web_content",
+            )
+            if cached and "content" in cached:
+                markdown_content = cached["content"]
+            else:
+
+                def _convert():
+                    # Plain HTML takes the direct markdownify path: no
+                    # converter dispatch, no magic-bytes sniffing, just the
+                    # HTML-to-markdown pass MarkItDown would end at anyway.
+                    content_type = (
+                        response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                    )
+                    if content_type in ("text/html", "application/xhtml+xml"):
+                        return markdownify.markdownify(response.text, heading_style="ATX")
+
+                    # PDFs and everything else keep MarkItDown's full
+                    # pipeline, which picks the right converter per format.
+                    md = MarkItDown(requests_session=_SESSION)
+                    result = md.convert(response)
+                    return result.text_content
+
+                markdown_content = await asyncio.to_thread(_convert)
+
+        await write_to_cache(url, markdown_content, validators.get("content_hash"))
+        await cache_put(
+            CACHE_DIR,
+            key=url_key,
+            value=validators,
+            collection="web_validators",
+            ttl=CACHE_TTL,
+        )
+        await ctx.info("Content extracted successfully")
+    else:
+        await ctx.info("Content retrieved from cache")
+
+    return markdown_content
+
+
+@mcp.tool
+async def extract_many(
+    urls: Annotated[List[str], Field(description="URLs of the web pages")],
+    ctx: Context,
+    max_lines: Annotated[
+        Optional[int],
+        Field(description="Return only first N lines of Markdown output per page", default=None),
+    ] = None,
+) -> List[str]:
+    """
+    Convert several web pages to Markdown concurrently.
+
+    Runs the extractions with asyncio.gather bounded by
+    WEB_EXTRACT_CONCURRENCY, so a list of URLs costs roughly the slowest
+    fetch instead of the sum. Failed URLs yield their error message in
+    place, keeping results aligned with the input order.
+
+    Args:
+        urls: URLs of the web pages (http:// or https://)
+        max_lines: Return only first N lines of Markdown output per page
+
+    Returns:
+        Markdown content per URL, in input order
+    """
+    semaphore = asyncio.Semaphore(EXTRACT_CONCURRENCY)
+
+    async def _extract_one(one_url: str) -> str:
+        async with semaphore:
+            return truncate_text(await _extract_markdown(one_url, ctx), max_lines)
+
+    await ctx.info(f"Extracting content from {len(urls)} URLs")
+    results = await asyncio.gather(*(_extract_one(u) for u in urls), return_exceptions=True)
+    return [str(result) if isinstance(result, Exception) else result for result in results]
+
+
 @mcp.tool
 async def map(
     url: Annotated[str, Field(description="Starting URL to map")],
@@ -152,29 +321,68 @@ async def map(
     try:
         await ctx.info(f"Creating website map (max {max_requests} pages)")
 
-        crawler = PlaywrightCrawler(
+        # Adaptive crawler: static pages are fetched with a plain HTTP GET
+        # and parsed with BeautifulSoup; Chromium only renders the pages
+        # predicted to need JS. When it does render, use a small fixed
+        # viewport, no GPU, and /dev/shm off for containers.
+        crawler = AdaptivePlaywrightCrawler.with_beautifulsoup_static_parser(
             max_requests_per_crawl=max_requests,
-            headless=True,
-            browser_type="chromium",
-            browser_launch_options={"args": ["--no-sandbox", "--disable-setuid-sandbox"]},
+            playwright_crawler_specific_kwargs={
+                "headless": True,
+                "browser_type": "chromium",
+                "browser_launch_options": {
+                    "args": [
+                        "--no-sandbox",
+                        "--disable-setuid-sandbox",
+                        "--disable-gpu",
+                        "--disable-dev-shm-usage",
+                    ]
+                },
+                "browser_new_context_options": {"viewport": {"width": 1280, "height": 720}},
+            },
         )
 
+        @crawler.pre_navigation_hook(playwright_only=True)
+        async def block_assets(context: AdaptivePlaywrightPreNavCrawlingContext) -> None:
+            # URL + <title> need neither pixels nor styling; aborting by
+            # resource type drops most of the transfer and decode work on
+            # asset-heavy sites.
+            await context.page.route(
+                "**/*",
+                lambda route: route.abort()
+                if route.request.resource_type in {"image", "media", "font", "stylesheet"}
+                else route.continue_(),
+            )
+
+        # The tool doesn't need persistence, so pages are collected in a
+        # local list instead of pushed through the default Dataset and read
+        # back in full before returning.
+        results: list[dict] = []
+
         @crawler.router.default_handler
-        async def request_handler(context: PlaywrightCrawlingContext) -> None:
-            await context.push_data(
+        async def request_handler(context: AdaptivePlaywrightCrawlingContext) -> None:
+            # parsed_content is available on both the static and the
+            # rendered path, so the handler doesn't care which one ran.
+            title_tag = context.parsed_content.title
+            results.append(
                 {
                     "url": context.request.url,
-                    "title": await context.page.title(),
+                    "title": title_tag.string if title_tag else "",
                 }
             )
             await context.enqueue_links(strategy="same-domain")
 
         await crawler.run([url])
 
-        dataset = await Dataset.open()
-        data = await dataset.get_data()
-        await ctx.info(f"Site map completed, found {len(data.items)} pages")
-        return data
+        await ctx.info(f"Site map completed, found {len(results)} pages")
+        return DatasetItemsListPage.model_construct(
+            items=results,
+            count=len(results),
+            total=len(results),
+            offset=0,
+            limit=len(results),
+            desc=False,
+        )
     except Exception as e:
         await ctx.error(f"Site map generation failed: {e}")
         raise
@@ -1,10 +1,10 @@
 import os
-import asyncio
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
-from mcp.client.stdio import stdio_client, StdioServerParameters
-from mcp import ClientSession
+from mcp.client.stdio import StdioServerParameters
+
+from automas.mcp_client_session import SessionHolder
 
 
 PROJECT_ROOT = Path(r"C:/Users/oklad/Desktop/LLM_Games").resolve()
@@ -43,27 +43,22 @@ def _pack_texts(result) -> List[str]:
     return texts
 
 
-async def call_file_analysis_tool(tool_name: str, payload: Dict[str, Any], timeout: int = 120) -> List[str]:
-    """
-    ВАЖНО: делаем 'одноразовый' lifecycle (stdio_client -> session -> close).
-    Это самый стабильный режим на Windows.
-    """
-    server_params = StdioServerParameters(
+# Один живой subprocess на весь процесс; MCP_REUSE_SESSION=0 возвращает
+# одноразовый lifecycle (самый стабильный режим на Windows).
+_session_holder = SessionHolder(
+    StdioServerParameters(
         command="python",
         args=["-m", MCP_MODULE],
         env=_build_env(),
         cwd=str(PROJECT_ROOT),
-    )
+    ),
+    errlog_path=PROJECT_ROOT / "file_analysis_mcp.stderr.log",
+)
 
-    # stderr лучше уводить в файл, чтобы не было блокировок
-    errlog_path = PROJECT_ROOT / "file_analysis_mcp.stderr.log"
-    errlog = open(errlog_path, "wb")
 
-    async with stdio_client(server_params, errlog=errlog) as (read, write):
-        async with ClientSession(read, write) as session:
-            await asyncio.wait_for(session.initialize(), timeout=10)
-            res = await asyncio.wait_for(session.call_tool(tool_name, payload), timeout=timeout)
-            return _pack_texts(res)
+async def call_file_analysis_tool(tool_name: str, payload: Dict[str, Any], timeout: int = 120) -> List[str]:
+    res = await _session_holder.call(tool_name, payload, timeout=timeout)
+    return _pack_texts(res)
 
 
 async def extract_text(file_path: str, timeout: int = 180) -> str:
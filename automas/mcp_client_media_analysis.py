@@ -1,10 +1,12 @@
 # automas/mcp_client_media_analysis.py
-import os, json, asyncio
+import os, asyncio
 from pathlib import Path
 from typing import Dict, Any, List
 
-from mcp.client.stdio import stdio_client, StdioServerParameters
-from mcp import ClientSession
+import orjson
+from mcp.client.stdio import StdioServerParameters
+
+from automas.mcp_client_session import SessionHolder
 
 PROJECT_ROOT = Path(r"C:/Users/oklad/Desktop/LLM_Games").resolve()
 GAIA_FILES_ROOT = PROJECT_ROOT / "workspace" / "gaia_files"
@@ -25,26 +27,27 @@ def _join_content_text(res) -> str:
     return "\n".join(parts).strip()
 
 
-async def _call_tool(tool_name: str, payload: Dict[str, Any], timeout: int = 120) -> Dict[str, Any]:
-    errlog = open(PROJECT_ROOT / "media_mcp.stderr.log", "ab")
-
-    params = StdioServerParameters(
+# Один живой subprocess на весь процесс; MCP_REUSE_SESSION=0 возвращает
+# одноразовый lifecycle.
+_session_holder = SessionHolder(
+    StdioServerParameters(
         command="python",
         args=["-m", MCP_MODULE],
         env=_build_env(),
         cwd=str(PROJECT_ROOT),
-    )
+    ),
+    errlog_path=PROJECT_ROOT / "media_mcp.stderr.log",
+)
 
-    async with stdio_client(params, errlog=errlog) as (r, w):
-        async with ClientSession(r, w) as session:
-            await asyncio.wait_for(session.initialize(), timeout=10)
-            res = await asyncio.wait_for(session.call_tool(tool_name, payload), timeout=timeout)
+
+async def _call_tool(tool_name: str, payload: Dict[str, Any], timeout: int = 120) -> Dict[str, Any]:
+    res = await _session_holder.call(tool_name, payload, timeout=timeout)
 
     raw = _join_content_text(res)
 
     # MCP tool возвращает JSON строкой {"analysis": "...", "error": null}
     try:
-        data = json.loads(raw)
+        data = orjson.loads(raw)
     except Exception:
         data = {"analysis": raw, "error": None}
 
@@ -78,3 +81,29 @@ async def analyze_video(file_path: str, prompt: str, max_tokens: int = 2048, tim
         timeout=timeout,
     )
     return data.get("analysis", "")
+
+
+_ANALYZE_MANY_CONCURRENCY = int(os.getenv("MEDIA_CLIENT_CONCURRENCY", "8"))
+
+
+async def analyze_many(jobs: List[Dict[str, Any]]) -> List[str]:
+    """Run several independent media-analysis jobs concurrently.
+
+    Each job is {"tool": <tool name>, "payload": {...}, "timeout": <optional
+    seconds>}. Jobs dispatch in parallel over the shared MCP session
+    (bounded by MEDIA_CLIENT_CONCURRENCY to respect model rate limits), so
+    N analyses cost roughly the slowest one instead of the sum. Results
+    come back in input order; any failure raises as a grouped exception.
+    """
+    semaphore = asyncio.Semaphore(_ANALYZE_MANY_CONCURRENCY)
+
+    async def _run(job: Dict[str, Any]) -> str:
+        async with semaphore:
+            data = await _call_tool(
+                job["tool"], job["payload"], timeout=job.get("timeout", 180)
+            )
+            return data.get("analysis", "")
+
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(_run(job)) for job in jobs]
+    return [task.result() for task in tasks]
@@ -0,0 +1,101 @@
+"""Reusable MCP stdio session shared by the mcp_client_* modules.
+
+Each tool call used to spawn `python -m automas.mcp.servers.*` fresh, pay
+interpreter startup plus the server's import graph, run one tool, and tear
+the process down — hundreds of ms to seconds of overhead per call.
+SessionHolder opens the stdio transport once and reuses the initialized
+ClientSession for every subsequent call.
+
+Set MCP_REUSE_SESSION=0 to fall back to the old one-shot lifecycle
+(spawn, call, close), which is the most conservative mode on Windows.
+"""
+
+import asyncio
+import atexit
+import contextlib
+import os
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from mcp import ClientSession
+from mcp.client.stdio import StdioServerParameters, stdio_client
+
+REUSE_SESSION = os.getenv("MCP_REUSE_SESSION", "1") == "1"
+
+_INIT_TIMEOUT = 10
+
+
+class SessionHolder:
+    def __init__(self, server_params: StdioServerParameters, errlog_path: Path):
+        self._server_params = server_params
+        self._errlog_path = errlog_path
+        self._errlog = None
+        self._stack: Optional[AsyncExitStack] = None
+        self._session: Optional[ClientSession] = None
+        # Guards session creation only: ClientSession multiplexes
+        # concurrent requests over the pipe by request id, so calls
+        # themselves can overlap; the lock just keeps two callers from
+        # both spawning a server.
+        self._lock = asyncio.Lock()
+        atexit.register(self._close_at_exit)
+
+    def _get_errlog(self):
+        # stderr goes to a file so a chatty server can't fill the pipe and
+        # deadlock the subprocess.
+        if self._errlog is None:
+            self._errlog = open(self._errlog_path, "ab")
+        return self._errlog
+
+    async def _ensure_session(self) -> ClientSession:
+        if self._session is None:
+            stack = AsyncExitStack()
+            read, write = await stack.enter_async_context(
+                stdio_client(self._server_params, errlog=self._get_errlog())
+            )
+            session = await stack.enter_async_context(ClientSession(read, write))
+            await asyncio.wait_for(session.initialize(), timeout=_INIT_TIMEOUT)
+            self._stack = stack
+            self._session = session
+        return self._session
+
+    async def call(self, tool_name: str, payload: Dict[str, Any], timeout: int = 120) -> Any:
+        """Call a tool on the held session, spawning the server on first use."""
+        if not REUSE_SESSION:
+            return await self._call_one_shot(tool_name, payload, timeout)
+
+        async with self._lock:
+            session = await self._ensure_session()
+        try:
+            return await asyncio.wait_for(session.call_tool(tool_name, payload), timeout=timeout)
+        except Exception:
+            # Anything from a timeout to a dead subprocess leaves the
+            # pipe in an unknown state; drop it so the next call
+            # respawns cleanly.
+            await self.aclose()
+            raise
+
+    async def _call_one_shot(self, tool_name: str, payload: Dict[str, Any], timeout: int) -> Any:
+        async with stdio_client(self._server_params, errlog=self._get_errlog()) as (read, write):
+            async with ClientSession(read, write) as session:
+                await asyncio.wait_for(session.initialize(), timeout=_INIT_TIMEOUT)
+                return await asyncio.wait_for(
+                    session.call_tool(tool_name, payload), timeout=timeout
+                )
+
+    async def aclose(self) -> None:
+        stack, self._stack, self._session = self._stack, None, None
+        if stack is not None:
+            with contextlib.suppress(Exception):
+                await stack.aclose()
+
+    def _close_at_exit(self) -> None:
+        # Best effort: if no loop is running we can still close properly;
+        # otherwise the OS closing our end of the pipes terminates the
+        # subprocess anyway.
+        if self._stack is not None:
+            with contextlib.suppress(Exception):
+                asyncio.run(self.aclose())
+        if self._errlog is not None:
+            with contextlib.suppress(Exception):
+                self._errlog.close()
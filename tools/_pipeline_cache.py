@@ -0,0 +1,24 @@
+"""Cached builder for the single-agent example pipelines.
+
+Every script here compiles an identical one-node graph on each run,
+re-resolving the MCP toolset each time. Caching the built pipeline on
+(name, tools, instructions) makes the rebuild free when several
+pipelines run in one process, and costs nothing for single-script runs.
+"""
+
+import functools
+
+from automas import AgentNode, PipelineBuilder
+
+
+@functools.lru_cache(maxsize=32)
+def build_pipeline(name: str, tools: tuple, instructions: str):
+    builder = PipelineBuilder()
+    builder.add_node(
+        AgentNode(
+            name=name,
+            instructions=instructions,
+            mcp_tools=list(tools),
+        )
+    )
+    return builder.build()
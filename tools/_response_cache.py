@@ -0,0 +1,44 @@
+"""Exact-match response cache for the example pipelines.
+
+Repeat runs of these scripts re-send byte-identical hard-coded queries
+and pay a full model invocation each time. cached_ainvoke puts an
+on-disk cache in front of pipeline.ainvoke, keyed on the normalized
+query plus the toolset, so reruns return the previous answer with zero
+tokens spent. Run with PIPELINE_CACHE=0 (or delete
+~/.automas/pipeline_cache) to force fresh model calls.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Iterable
+
+import orjson
+
+CACHE_DIR = Path.home() / ".automas" / "pipeline_cache"
+ENABLED = os.getenv("PIPELINE_CACHE", "1") == "1"
+
+
+def _cache_key(query: str, tools: Iterable[str]) -> str:
+    normalized = " ".join(query.split())
+    material = f"{normalized}|{','.join(sorted(tools))}"
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+async def cached_ainvoke(pipeline, query: str, tools: Iterable[str] = ()) -> str:
+    """pipeline.ainvoke with an exact-match disk cache in front."""
+    if not ENABLED:
+        return await pipeline.ainvoke(query)
+
+    path = CACHE_DIR / f"{_cache_key(query, tools)}.json"
+    if path.exists():
+        entry = orjson.loads(path.read_bytes())
+        print(f"[pipeline-cache] hit, ~{entry['tokens_saved']} tokens saved")
+        return entry["result"]
+
+    result = await pipeline.ainvoke(query)
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    text = str(result)
+    path.write_bytes(orjson.dumps({"result": text, "tokens_saved": max(1, len(text) // 4)}))
+    return result
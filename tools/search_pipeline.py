@@ -1,27 +1,21 @@
-import asyncio
-
-from automas import AgentNode, PipelineBuilder
+from tools._pipeline_cache import build_pipeline
+from tools._runtime import run
+from tools._response_cache import cached_ainvoke
 
 
 async def main():
-    builder = PipelineBuilder()
-
-    builder.add_node(
-        AgentNode(
-            name="WebResearcher",
-            instructions="""You are a web research assistant
+    pipeline = build_pipeline(
+        "WebResearcher",
+        ("web-search",),
+        """You are a web research assistant
             Be thorough and informative about your research results.""",
-            mcp_tools=["web-search"],
-        )
     )
 
-    pipeline = builder.build()
-
     query = """
     What was the volume in m^3 of the fish bag that was calculated in the University of Leicester paper "Can Hiccup Supply Enough Fish to Maintain a Dragon’s Diet?
     """
 
-    result = await pipeline.ainvoke(query)
+    result = await cached_ainvoke(pipeline, query, tools=["web-search"])
 
     print(f"\nFinal Result:\n{'-' * 60}")
     print(result)
@@ -29,4 +23,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,26 +1,20 @@
-import asyncio
-
-from automas import AgentNode, PipelineBuilder
+from tools._pipeline_cache import build_pipeline
+from tools._runtime import run
+from tools._response_cache import cached_ainvoke
 
 
 async def main():
-    builder = PipelineBuilder()
-
-    builder.add_node(
-        AgentNode(
-            name="VideoAnalyzer",
-            instructions="""You are an video analysis assistant.
+    pipeline = build_pipeline(
+        "VideoAnalyzer",
+        ("media-analysis",),
+        """You are an video analysis assistant.
             When asked to analyze videos, use the video tools to process them.
 
             Be brief about the analysis results.""",
-            mcp_tools=["media-analysis"],
-        )
     )
 
-    pipeline = builder.build()
-
     query = """In the video https://www.youtube.com/watch?v=L1vXCYZAYYM, what is the highest number of bird species to be on camera simultaneously?"""
-    result = await pipeline.ainvoke(query)
+    result = await cached_ainvoke(pipeline, query, tools=["media-analysis"])
 
     print(f"\nFinal Result:\n{'-' * 60}")
     print(result)
@@ -28,4 +22,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
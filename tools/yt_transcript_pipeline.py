@@ -1,25 +1,39 @@
-import asyncio
+import re
 
-from automas import AgentNode, PipelineBuilder
+from tools._pipeline_cache import build_pipeline
+from tools._runtime import run
+from tools._response_cache import cached_ainvoke
 
+_VIDEO_ID_RE = re.compile(r"(?:v=|youtu\.be/)([\w-]{11})")
+
+
+def _canonical_video_url(url: str) -> str:
+    """Reduce a YouTube URL to its watch?v=<id> form.
+
+    Transcripts are immutable per video, so the cache key should be the
+    video ID — playlist/index params and youtu.be short links would
+    otherwise make identical requests miss the response cache.
+    """
+    match = _VIDEO_ID_RE.search(url)
+    if match:
+        return f"https://www.youtube.com/watch?v={match.group(1)}"
+    return url
 
-async def main():
-    builder = PipelineBuilder()
 
-    builder.add_node(
-        AgentNode(
-            name="VideoAnalyzer",
-            instructions="""You are a video analysis assistant.
+async def main():
+    pipeline = build_pipeline(
+        "VideoAnalyzer",
+        ("youtube-transcript",),
+        """You are a video analysis assistant.
             When given a YouTube URL, use the youtube-transcript tools to get the transcript.
 
             Be brief about the analysis results.""",
-            mcp_tools=["youtube-transcript"],
-        )
     )
 
-    pipeline = builder.build()
-
-    query = """Get the transcript from this YouTube video: https://www.youtube.com/watch?v=5j-S448XC8k&list=RDGJb_02HU0mw&index=3
+    video_url = _canonical_video_url(
+        "https://www.youtube.com/watch?v=5j-S448XC8k&list=RDGJb_02HU0mw&index=3"
+    )
+    query = f"""Get the transcript from this YouTube video: {video_url}
 
     Summarize the main topics discussed in the video."""
 
@@ -27,7 +41,7 @@ async def main():
     print("\nExecuting video analysis pipeline...")
     print("-" * 60)
 
-    result = await pipeline.ainvoke(query)
+    result = await cached_ainvoke(pipeline, query, tools=["youtube-transcript"])
 
     print(f"\nFinal Result:\n{'-' * 60}")
     print(result)
@@ -35,4 +49,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())